@@ -1,72 +1,66 @@
 from datetime import datetime, timedelta
 import alg_helper
+import holiday_calendar
 
 """
 Uses a Depth-First Search approach to find a valid schedule that meets all minimum staffing requirements.
+slot_candidates (optional, warm start) is a list aligned with day_indices of {shift_name: employees}
+giving the order to try employees in for that slot, hinted employees first.
 """
-def dfs_scheduling(schedule, employee_hours, day_indices, day_index, shift_index, slot_index, num_days,employees_list, shifts_list):
+def dfs_scheduling(schedule, employee_hours, day_indices, day_index, shift_index, slot_index, num_days,employees_list, shifts_list, stats=None, depth=0, holiday_mask=None, week_keys=None, slot_candidates=None):
+    # Holiday lookup is precomputed once per solve (list of bools aligned with day_indices)
+    if holiday_mask is None:
+        holiday_mask = holiday_calendar.holiday_mask(day_indices)
+    # ISO week of each day; employee_hours is an hours ledger {emp_id: {"2025-W27": hours}}
+    if week_keys is None:
+        week_keys = alg_helper.week_keys(day_indices)
+
+    # Search counters (see alg_helper.new_search_stats)
+    if stats is not None:
+        stats['nodes_expanded'] += 1
+        if depth > stats['max_depth']:
+            stats['max_depth'] = depth
+        # Search budget exhausted: fail this branch (and so every branch above it)
+        if stats['node_limit'] is not None and stats['nodes_expanded'] > stats['node_limit']:
+            return False
+
     # A valid schedule is found
     if day_index == num_days:
         return True 
 
     current_date_str = day_indices[day_index]
     
-
-    is_holiday = False
-    for holiday_entry in alg_helper.holidays:
-        if holiday_entry[0] == current_date_str:
-            is_holiday = True
-            break
-            
     # If it's a holiday, skip all shifts for the day and move to the next day.
-    if is_holiday:
-        print(f"NOTE: Skipping scheduling on holiday: {current_date_str}")
-        
-        # Weekly hours reset
-        next_day_num = day_index + 1
-        next_employee_hours = employee_hours
+    if holiday_mask[day_index]:
+        if alg_helper.VERBOSE:
+            alg_helper.trace(f"NOTE: Skipping scheduling on holiday: {current_date_str}")
 
-        if next_day_num > 0 and (next_day_num % 7) == 0:
-            print(f"WEEKLY HOURS RESET AT DAY {next_day_num}.")
-            
-            next_employee_hours = {
-                emp_id: {'current_hours': 0} 
-                for emp_id, data in employee_hours.items()
-            }
-
-        return dfs_scheduling(schedule, next_employee_hours, day_indices, next_day_num, 0, 0, num_days,employees_list, shifts_list)
+        return dfs_scheduling(schedule, employee_hours, day_indices, day_index + 1, 0, 0, num_days,employees_list, shifts_list, stats, depth + 1, holiday_mask, week_keys, slot_candidates)
 
 
     # Move to the next shift or next day
     if shift_index >= len(shifts_list):
-        next_day_index = day_index + 1
-        
-        # Weekly Hours Reset 
-        next_employee_hours = employee_hours
-        if next_day_index > 0 and (next_day_index % 7) == 0:
-            print(f"WEEKLY HOURS RESET AT DAY {next_day_index}.")
-            
-            next_employee_hours = {
-                emp_id: {'current_hours': 0} 
-                for emp_id, data in employee_hours.items()
-            }
-
-        return dfs_scheduling(schedule, next_employee_hours, day_indices, next_day_index, 0, 0, num_days, employees_list, shifts_list)
+        # No weekly reset needed: hours are kept per ISO week, so a new week simply starts at 0
+        return dfs_scheduling(schedule, employee_hours, day_indices, day_index + 1, 0, 0, num_days, employees_list, shifts_list, stats, depth + 1, holiday_mask, week_keys, slot_candidates)
 
     current_shift = shifts_list[shift_index]
     shift_name = current_shift['shift_name']
-    min_employees = current_shift.get('min_employees', 0)
+    min_employees = alg_helper.shift_bounds(current_shift, current_date_str)[0]
 
 
     # Move to the next shift if all mandatory slots for the current shift are filled
     if slot_index >= min_employees:
-        return dfs_scheduling(schedule, employee_hours, day_indices, day_index, shift_index + 1, 0, num_days, employees_list, shifts_list)
+        return dfs_scheduling(schedule, employee_hours, day_indices, day_index, shift_index + 1, 0, num_days, employees_list, shifts_list, stats, depth + 1, holiday_mask, week_keys, slot_candidates)
     
 
     shift_duration = alg_helper.get_shift_duration(current_shift)
+    week_key = week_keys[day_index]
+
+    # Warm start: try the hinted employees for this slot first, then everyone else in list order
+    candidates = slot_candidates[day_index].get(shift_name, employees_list) if slot_candidates else employees_list
 
     # Iterate through all employees to find a valid assignment
-    for employee in employees_list:
+    for employee in candidates:
         emp_id = employee['id']
         emp_name = employee['name']
         
@@ -75,7 +69,7 @@ def dfs_scheduling(schedule, employee_hours, day_indices, day_index, shift_index
             continue
         
         # Constraint Check: Weekly hours limit
-        current_week_hours = employee_hours[emp_id]['current_hours']
+        current_week_hours = employee_hours[emp_id].get(week_key, 0)
         max_hours = employee['hours_per_week']
         
         if current_week_hours + shift_duration > max_hours:
@@ -97,58 +91,60 @@ def dfs_scheduling(schedule, employee_hours, day_indices, day_index, shift_index
         
         # Update changes
         schedule[current_date_str][shift_name].append(emp_name)
-        employee_hours[emp_id]['current_hours'] += shift_duration
+        employee_hours[emp_id][week_key] = current_week_hours + shift_duration
         
         # Recursive Call 
-        if dfs_scheduling(schedule, employee_hours, day_indices, day_index, shift_index, slot_index + 1, num_days,employees_list, shifts_list):
+        if dfs_scheduling(schedule, employee_hours, day_indices, day_index, shift_index, slot_index + 1, num_days,employees_list, shifts_list, stats, depth + 1, holiday_mask, week_keys, slot_candidates):
             return True # Solution found down this path
 
         # Dead end 
         schedule[current_date_str][shift_name].pop()
-        employee_hours[emp_id]['current_hours'] -= shift_duration
+        employee_hours[emp_id][week_key] = current_week_hours
+        if stats is not None:
+            stats['backtracks'] += 1
         
     # If no employee can be assigned to this slot, backtracks to the previous slot/shift/day
     return False
 
 """
 Iterates through a valid schedule to assign extra staff where possible without exceeding maximum hour limits.
+employee_hours is the same per-ISO-week ledger the DFS filled in, so it is read and updated in place.
+past_hours {emp_id: hours} from earlier weeks (optional) is added to the fairness sort.
+hints (optional, warm start) is a list aligned with day_indices of {shift_name: [names]}; hinted
+employees are picked before the fairness order so the result stays close to the prior schedule.
 """
-def scheduleMaximizer(schedule, employee_hours, day_indices, day_index, shift_index, slot_index, num_days, employees_list, shifts_list):
+def scheduleMaximizer(schedule, employee_hours, day_indices, day_index, shift_index, slot_index, num_days, employees_list, shifts_list, stats=None, holiday_mask=None, week_keys=None, past_hours=None, hints=None):
+    if holiday_mask is None:
+        holiday_mask = holiday_calendar.holiday_mask(day_indices)
+    if week_keys is None:
+        week_keys = alg_helper.week_keys(day_indices)
+    if past_hours is None:
+        past_hours = {}
     shifts_map = {shift['shift_name']: shift for shift in shifts_list}
 
-    # Process week by week (every 7 days)
-    for week_start in range(0, num_days, 7):
-        week_days = day_indices[week_start : week_start + 7]
-        
-        # Track hours just for this specific week to keep the fairness sort accurate
-        current_week_hours = {emp['id']: 0.0 for emp in employees_list}
-        for day in week_days:
-            for s_name, assigned_names in schedule[day].items():
-                shift_duration = alg_helper.get_shift_duration(shifts_map[s_name])
-                for name in assigned_names:
-                    # Find the ID for this name to update their week total
-                    for employee in employees_list:
-                        if employee['name'] == name:
-                            current_week_hours[employee['id']] += shift_duration
+    # Group the horizon's day positions by ISO week, in order
+    weeks = []
+    for position, week_key in enumerate(week_keys):
+        if not weeks or week_keys[weeks[-1][0]] != week_key:
+            weeks.append([])
+        weeks[-1].append(position)
+
+    # Process week by week
+    for week_positions in weeks:
+        week_key = week_keys[week_positions[0]]
 
         added_in_this_lap = True
         while added_in_this_lap:
             added_in_this_lap = False
 
-            for day in week_days:
-                is_holiday = False
-                
-                for holiday_entry in alg_helper.holidays:
-                    if holiday_entry[0] == day:
-                        is_holiday = True
-                        break  
-
-                if is_holiday:
+            for position in week_positions:
+                if holiday_mask[position]:
                     continue
+                day = day_indices[position]
 
                 for shift_name, assigned_emps in schedule[day].items():
                     shift_info = shifts_map[shift_name]
-                    max_employees = shift_info.get('max_employees', 0)
+                    max_employees = alg_helper.shift_bounds(shift_info, day)[1]
                     shift_duration = alg_helper.get_shift_duration(shift_info)
 
                     if len(assigned_emps) < max_employees:
@@ -162,16 +158,23 @@ def scheduleMaximizer(schedule, employee_hours, day_indices, day_index, shift_in
                             if not alg_helper.is_employee_available(employee, day, shift_name): continue
                             
                             # 3. Check if they have room in their weekly hours
-                            if current_week_hours[employee['id']] + shift_duration <= employee['hours_per_week']:
+                            if employee_hours[employee['id']].get(week_key, 0) + shift_duration <= employee['hours_per_week']:
                                 eligible_emps.append(employee)
 
                         if eligible_emps:
-                            # Fairness Sort: Pick the person with the least hours in THIS week
-                            eligible_emps.sort(key=lambda emp: current_week_hours[emp['id']])
+                            # Fairness Sort: Pick the person with the least hours in THIS week (plus any carried history),
+                            # hinted employees first when warm starting
+                            eligible_emps.sort(key=lambda emp: employee_hours[emp['id']].get(week_key, 0) + past_hours.get(emp['id'], 0))
+                            hinted = hints[position].get(shift_name) if hints else None
+                            if hinted:
+                                eligible_emps.sort(key=lambda emp: emp['name'] not in hinted)
                             top_candidate = eligible_emps[0]
 
                             assigned_emps.append(top_candidate['name'])
-                            current_week_hours[top_candidate['id']] += shift_duration
+                            candidate_hours = employee_hours[top_candidate['id']]
+                            candidate_hours[week_key] = candidate_hours.get(week_key, 0) + shift_duration
                             added_in_this_lap = True 
+                            if stats is not None:
+                                stats['slots_filled'] += 1
                             
     return schedule
\ No newline at end of file
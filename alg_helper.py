@@ -1,5 +1,32 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 import csv
+import os
+
+# Verbose solver tracing (per-holiday / weekly-reset messages). Off by default since these fire
+# on the recursive hot path; enable with SCHEDULER_VERBOSE=1.
+VERBOSE = os.getenv("SCHEDULER_VERBOSE", "0") == "1"
+
+"""
+Prints a solver trace message. Callers on hot paths should check VERBOSE first to skip formatting.
+"""
+def trace(message):
+    if VERBOSE:
+        print(message)
+
+"""
+Creates the counter dict that dfs_scheduling and scheduleMaximizer fill in when passed as stats.
+"""
+def new_search_stats(node_limit=None):
+    return {
+        "node_limit": node_limit, # Give up (fail the search) after this many DFS nodes; None = unlimited
+        "nodes_expanded": 0,
+        "backtracks": 0,
+        "max_depth": 0,
+        "slots_filled": 0,
+        "hint_slots": 0, # Warm start: assignments in the hint that could apply to this horizon
+        "hint_hits": 0   # ...and how many of them the result kept
+    }
 
 """
 Calculates the total hours of a shift based on its start and end times.
@@ -14,6 +41,59 @@ def get_shift_duration(shift):
     except ValueError:
         return 8 
 
+"""
+Returns (min_employees, max_employees) for a shift on a date. Shifts may carry optional
+"min_by_weekday"/"max_by_weekday" maps {weekday: count} (Monday = 0), e.g. from a what-if scenario.
+"""
+def shift_bounds(shift, date_str):
+    min_employees = shift.get('min_employees', 0)
+    max_employees = shift.get('max_employees', 0)
+    if 'min_by_weekday' in shift or 'max_by_weekday' in shift:
+        weekday = weekday_of(date_str)
+        min_employees = shift.get('min_by_weekday', {}).get(weekday, min_employees)
+        max_employees = shift.get('max_by_weekday', {}).get(weekday, max_employees)
+    return min_employees, max_employees
+
+@lru_cache(maxsize=4096)
+def weekday_of(date_str):
+    return datetime.strptime(date_str, '%Y-%m-%d').weekday()
+
+"""
+Returns the ISO week key ("2025-W27") a date falls in; weekly hour caps and the hours ledger use it.
+"""
+@lru_cache(maxsize=4096)
+def iso_week_key(date_str):
+    year, week, _ = datetime.strptime(date_str, '%Y-%m-%d').isocalendar()
+    return f"{year}-W{week:02d}"
+
+def week_keys(day_indices):
+    return [iso_week_key(date_str) for date_str in day_indices]
+
+"""
+Lines a prior schedule {date: {shift: [names]}} up with the horizon for a warm start. The prior period is
+moved by the whole number of weeks that best lines its start up with the horizon's (0 when they overlap),
+so a two-week roster maps day for day onto the next two weeks. Days the move leaves uncovered take the
+latest prior day on the same weekday. Returns a list aligned with day_indices of {shift: [names]}.
+"""
+def align_hint(day_indices, prior_schedule):
+    prior_dates = sorted(prior_schedule)
+    if not prior_dates or not day_indices:
+        return [{} for _ in day_indices]
+
+    latest_by_weekday = {}
+    for date_str in prior_dates:
+        latest_by_weekday[weekday_of(date_str)] = date_str
+    gap = datetime.strptime(day_indices[0], '%Y-%m-%d') - datetime.strptime(prior_dates[0], '%Y-%m-%d')
+    offset = timedelta(weeks=round(gap.days / 7))
+
+    aligned = []
+    for date_str in day_indices:
+        source = (datetime.strptime(date_str, '%Y-%m-%d') - offset).strftime('%Y-%m-%d')
+        if source not in prior_schedule:
+            source = latest_by_weekday.get(weekday_of(date_str))
+        aligned.append(prior_schedule[source] if source else {})
+    return aligned
+
 """
 Checks if an employee is eligible for a specific shift based on their availability and vacation.
 """
@@ -41,15 +121,90 @@ def is_scheduled_today(emp_name, date_str, schedule):
 
 
 """
-Loads a list of statutory holidays from a CSV file to be used by the scheduler.
+Loads a list of statutory holidays from a CSV file. holiday_calendar caches and indexes these per region.
+The files are edited by hand, so a row whose first field is not a YYYY-MM-DD date is skipped with a
+warning instead of failing every solve; columns after the name are ignored.
 """
 def read_holidays(filename="statHolidays.csv"):
     holidays = []
     with open(filename, "r", newline="") as f:
         reader = csv.reader(f)
-        for row in reader:
-            date, name = row
+        for line_number, row in enumerate(reader, start=1):
+            if not row or not any(field.strip() for field in row):
+                continue
+            date = row[0].strip()
+            try:
+                datetime.strptime(date, '%Y-%m-%d')
+            except ValueError:
+                print(f"WARNING: {filename}:{line_number}: skipping row, {date!r} is not a YYYY-MM-DD date")
+                continue
+            if len(row) > 2:
+                print(f"WARNING: {filename}:{line_number}: ignoring extra columns {row[2:]}")
+            name = row[1].strip() if len(row) > 1 and row[1].strip() else "Holiday"
             holidays.append([date, name])
     return holidays
 
-holidays = read_holidays()
\ No newline at end of file
+"""
+Checks that a schedule has the nested shape {YYYY-MM-DD: {shift: [names]}} with string names.
+Returns an error message, or None when the shape is valid.
+"""
+def schedule_shape_error(schedule):
+    if not isinstance(schedule, dict):
+        return "schedule must be an object of dates."
+    for date_str, shifts in schedule.items():
+        try:
+            datetime.strptime(date_str, '%Y-%m-%d')
+        except ValueError:
+            return f"{date_str} is not a YYYY-MM-DD date."
+        if not isinstance(shifts, dict):
+            return f"{date_str} must map shift names to lists of employee names."
+        for shift_name, names in shifts.items():
+            if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+                return f"{shift_name} on {date_str} must be a list of employee names."
+    return None
+
+"""
+Converts a nested {date: {shift: [names]}} schedule into the compact wire format:
+a name table plus columnar shift x day arrays holding indices into that table.
+"""
+def compact_schedule(schedule):
+    dates = list(schedule.keys())
+    shift_names = list(schedule[dates[0]].keys()) if dates else []
+
+    names = []
+    name_index = {}
+    assignments = []
+    for shift_name in shift_names:
+        shift_column = []
+        for date_str in dates:
+            slot = []
+            for emp_name in schedule[date_str][shift_name]:
+                if emp_name not in name_index:
+                    name_index[emp_name] = len(names)
+                    names.append(emp_name)
+                slot.append(name_index[emp_name])
+            shift_column.append(slot)
+        assignments.append(shift_column)
+
+    return {
+        "names": names,
+        "dates": dates,
+        "shifts": shift_names,
+        "assignments": assignments
+    }
+
+"""
+Rebuilds the nested {date: {shift: [names]}} schedule from the compact wire format.
+Raises ValueError for a name index that is not an int in range (negative indices would silently alias names).
+"""
+def expand_schedule(compact):
+    names = compact["names"]
+    schedule = {date_str: {} for date_str in compact["dates"]}
+    for shift_pos, shift_name in enumerate(compact["shifts"]):
+        for day_pos, date_str in enumerate(compact["dates"]):
+            indices = compact["assignments"][shift_pos][day_pos]
+            for i in indices:
+                if type(i) is not int or not 0 <= i < len(names):
+                    raise ValueError(f"name index {i!r} for {shift_name} on {date_str} is not a position in names ({len(names)} names)")
+            schedule[date_str][shift_name] = [names[i] for i in indices]
+    return schedule
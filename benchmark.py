@@ -0,0 +1,291 @@
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+import alg_helper
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+
+"""
+Builds a filled nested schedule {date: {shift: [names]}} shaped like a /generate result.
+"""
+def synthetic_schedule(num_employees, num_shifts, num_days, per_shift, seed=0):
+    rng = random.Random(seed)
+    names = [f"Employee {i:04d}" for i in range(num_employees)]
+    shift_names = [f"Shift {i}" for i in range(num_shifts)]
+    start_date = datetime(2025, 1, 6)
+
+    schedule = {}
+    for day in range(num_days):
+        date_str = (start_date + timedelta(days=day)).strftime('%Y-%m-%d')
+        working = rng.sample(names, min(num_employees, per_shift * num_shifts))
+        schedule[date_str] = {
+            shift_name: working[i * per_shift:(i + 1) * per_shift]
+            for i, shift_name in enumerate(shift_names)
+        }
+    return schedule
+
+"""
+Returns the best wall time in milliseconds of calling fn() over the given number of repeats.
+"""
+def best_time_ms(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+"""
+Compares serialization time and payload size of the nested and compact /generate formats.
+"""
+def bench_serialization(args):
+    schedule = synthetic_schedule(args.employees, args.shifts, args.days, args.per_shift, args.seed)
+
+    nested_payload = {"status": "success", "runtime": 0.0, "format": "nested", "schedule": schedule}
+    compact_payload = {"status": "success", "runtime": 0.0, "format": "compact",
+                       "schedule": alg_helper.compact_schedule(schedule)}
+
+    print(f"{args.employees} employees, {args.shifts} shifts, {args.days} days, {args.per_shift} per shift")
+    print(f"{'format':<10}{'build ms':>10}{'dumps ms':>10}{'bytes':>12}{'gzip bytes':>12}")
+    for label, payload, build in (
+        ("nested", nested_payload, lambda: schedule),
+        ("compact", compact_payload, lambda: alg_helper.compact_schedule(schedule)),
+    ):
+        body = json.dumps(payload).encode("utf-8")
+        build_ms = best_time_ms(build, args.repeats)
+        dumps_ms = best_time_ms(lambda: json.dumps(payload), args.repeats)
+        print(f"{label:<10}{build_ms:>10.2f}{dumps_ms:>10.2f}{len(body):>12}{len(gzip.compress(body)):>12}")
+
+
+
+"""
+Builds a seeded synthetic roster and shift list in the exact dict shapes that dfs_schedule_helper consumes.
+availability: chance an employee is available for a given shift.
+vacation: chance an employee has one vacation block (1-5 days) inside the horizon.
+slack: max_employees - min_employees for every shift.
+"""
+def synthetic_workload(seed, employees, shifts, days, availability=0.8, vacation=0.1,
+                       min_employees=2, slack=1, hours_per_week=40, start="2025-01-06"):
+    rng = random.Random(seed)
+    start_date = datetime.strptime(start, "%Y-%m-%d")
+
+    shift_starts = ["06:00", "14:00", "22:00", "10:00", "18:00", "02:00"]
+    user_shifts = []
+    for i in range(shifts):
+        shift_start = shift_starts[i % len(shift_starts)]
+        shift_end = f"{(int(shift_start[:2]) + 8) % 24:02d}:00"
+        user_shifts.append({
+            "owner_id": 1,
+            "shift_id": i + 1,
+            "shift_name": f"Shift {i + 1}",
+            "start": shift_start,
+            "end": shift_end,
+            "min_employees": min_employees,
+            "max_employees": min_employees + slack
+        })
+
+    user_emps = []
+    for i in range(employees):
+        vacation_list = []
+        if rng.random() < vacation:
+            vac_start = start_date + timedelta(days=rng.randrange(days))
+            vac_end = vac_start + timedelta(days=rng.randint(0, 4))
+            vacation_list.append([vac_start.strftime('%Y-%m-%d'), vac_end.strftime('%Y-%m-%d')])
+
+        user_emps.append({
+            "owner_id": 1,
+            "id": i + 1,
+            "name": f"Employee {i + 1:04d}",
+            "hours_per_week": hours_per_week,
+            "vacation": vacation_list,
+            "availability": {s["shift_name"]: int(rng.random() < availability) for s in user_shifts}
+        })
+
+    return start_date, days, user_emps, user_shifts
+
+# Named solver cases. Keep the DFS recursion depth (roughly days * shifts * (min_employees + 1))
+# under Python's default recursion limit, since that is what production runs with. "tight" backtracks
+# heavily (tens of thousands of nodes); loosen it before adding cases that are tighter still.
+SOLVER_CASES = {
+    "small":       dict(employees=8,   shifts=2, days=14, min_employees=1, slack=1),
+    "medium":      dict(employees=30,  shifts=3, days=28, min_employees=2, slack=2),
+    "large":       dict(employees=120, shifts=4, days=28, min_employees=3, slack=4),
+    "long_horizon": dict(employees=40, shifts=2, days=84, min_employees=2, slack=2, hours_per_week=32),
+    "sparse":      dict(employees=40,  shifts=3, days=28, availability=0.35, vacation=0.3, min_employees=2, slack=1),
+    "tight":       dict(employees=12,  shifts=3, days=14, availability=0.7, min_employees=2, slack=0),
+    "tight_hours": dict(employees=8,   shifts=2, days=14, min_employees=2, slack=0),
+    # "tight" regenerated for the next holiday-free period, warm started from the previous period's cold solve
+    "tight_warm":  dict(employees=12,  shifts=3, days=14, availability=0.7, min_employees=2, slack=0,
+                        start="2025-01-20", warm_start=True),
+    "infeasible":  dict(employees=6,   shifts=2, days=7,  min_employees=7, slack=0),
+}
+
+"""
+Solves one case and returns its timings (ms), search counters and peak traced memory (KiB).
+Timings are the best of the repeats; memory comes from a separate traced run since tracemalloc slows the solver.
+Cases with warm_start seed the solve with the schedule of the period before (same seed, start moved back).
+"""
+def run_solver_case(main, params, seed, repeats):
+    params = dict(params)
+    warm_start = params.pop("warm_start", False)
+    workload = synthetic_workload(seed, **params)
+
+    hint_schedule = None
+    if warm_start:
+        previous_start = (workload[0] - timedelta(days=params["days"])).strftime("%Y-%m-%d")
+        hint_schedule = main.dfs_schedule_helper(*synthetic_workload(seed, **dict(params, start=previous_start)))
+
+    best = None
+    for _ in range(repeats):
+        metrics = {"timings": {}, "search": alg_helper.new_search_stats()}
+        schedule = main.dfs_schedule_helper(*workload, metrics, hint_schedule=hint_schedule)
+        if best is None or metrics["timings"]["dfs"] < best[0]["timings"]["dfs"]:
+            best = (metrics, schedule)
+    metrics, schedule = best
+
+    tracemalloc.start()
+    main.dfs_schedule_helper(*workload, hint_schedule=hint_schedule)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "feasible": schedule is not None,
+        "dfs_ms": metrics["timings"]["dfs"] * 1000,
+        "maximizer_ms": metrics["timings"].get("maximizer", 0.0) * 1000,
+        "nodes_expanded": metrics["search"]["nodes_expanded"],
+        "backtracks": metrics["search"]["backtracks"],
+        "max_depth": metrics["search"]["max_depth"],
+        "slots_filled": metrics["search"]["slots_filled"],
+        "hint_hit_rate": main.hint_hit_rate(metrics["search"]),
+        "peak_kib": peak / 1024
+    }
+
+"""
+Compares a case result to its stored baseline and returns a list of regression messages.
+Counters are deterministic for a seed, so any increase is flagged; timings and memory get --tolerance.
+"""
+def find_regressions(result, baseline, tolerance):
+    problems = []
+    if result["feasible"] != baseline["feasible"]:
+        problems.append(f"feasible {baseline['feasible']} -> {result['feasible']}")
+    for key in ("nodes_expanded", "backtracks"):
+        if result[key] > baseline[key]:
+            problems.append(f"{key} {baseline[key]} -> {result[key]}")
+    for key in ("dfs_ms", "maximizer_ms", "peak_kib"):
+        # Ignore sub-millisecond noise
+        if result[key] > baseline[key] * (1 + tolerance) and result[key] - baseline[key] > 1.0:
+            problems.append(f"{key} {baseline[key]:.1f} -> {result[key]:.1f}")
+    return problems
+
+"""
+Runs the solver cases, prints a table and compares against benchmark_baseline.json.
+Exits non-zero when a regression is found; --save-baseline rewrites the stored baseline instead.
+"""
+def bench_solver(args):
+    import main
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+
+    cases = args.cases or list(SOLVER_CASES)
+    unknown = [name for name in cases if name not in SOLVER_CASES]
+    if unknown:
+        print(f"Unknown case(s): {', '.join(unknown)}. Choose from: {', '.join(SOLVER_CASES)}")
+        return 2
+
+    results = {}
+    regressions = 0
+    print(f"{'case':<14}{'ok':>4}{'dfs ms':>10}{'max ms':>10}{'nodes':>9}{'backtr':>9}"
+          f"{'depth':>7}{'filled':>8}{'hints':>7}{'peak KiB':>10}  status")
+    for name in cases:
+        result = run_solver_case(main, SOLVER_CASES[name], args.seed, args.repeats)
+        results[name] = result
+
+        status = "new"
+        if name in baseline:
+            problems = find_regressions(result, baseline[name], args.tolerance)
+            status = "REGRESSION: " + "; ".join(problems) if problems else "ok"
+            regressions += bool(problems)
+
+        print(f"{name:<14}{'yes' if result['feasible'] else 'no':>4}{result['dfs_ms']:>10.2f}"
+              f"{result['maximizer_ms']:>10.2f}{result['nodes_expanded']:>9}{result['backtracks']:>9}"
+              f"{result['max_depth']:>7}{result['slots_filled']:>8}"
+              f"{'-' if result['hint_hit_rate'] is None else format(result['hint_hit_rate'], '.0%'):>7}"
+              f"{result['peak_kib']:>10.1f}  {status}")
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    return 1 if regressions else 0
+
+
+"""
+Times schedule_validator.validate_schedule on a solved synthetic schedule (best of --repeats).
+"""
+def bench_validation(args):
+    import main
+    import schedule_validator
+
+    # min_employees=1 keeps the DFS shallow enough for long horizons; the maximizer then fills up to max
+    start_date, num_days, user_emps, user_shifts = synthetic_workload(
+        args.seed, args.employees, args.shifts, args.days, min_employees=1, slack=args.slack)
+    schedule = main.dfs_schedule_helper(start_date, num_days, user_emps, user_shifts)
+    if schedule is None:
+        print("Synthetic workload was infeasible; try another --seed")
+        return 1
+
+    assignments = sum(len(names) for shifts in schedule.values() for names in shifts.values())
+    result = schedule_validator.validate_schedule(schedule, user_emps, user_shifts)
+    validate_ms = best_time_ms(lambda: schedule_validator.validate_schedule(schedule, user_emps, user_shifts), args.repeats)
+    print(f"{assignments} assignments, {args.employees} employees, {args.shifts} shifts, {args.days} days")
+    print(f"validate: {validate_ms:.2f} ms ({validate_ms * 1000 / max(assignments, 1):.2f} us/assignment), "
+          f"valid={result['valid']}, scores={ {k: v for k, v in result['scores'].items() if k != 'hours_by_employee'} }")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ScheduleMaker benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serialization = subparsers.add_parser("serialization", help="nested vs compact /generate payloads")
+    serialization.add_argument("--employees", type=int, default=200)
+    serialization.add_argument("--shifts", type=int, default=4)
+    serialization.add_argument("--days", type=int, default=56)
+    serialization.add_argument("--per-shift", type=int, default=12)
+    serialization.add_argument("--repeats", type=int, default=20)
+    serialization.add_argument("--seed", type=int, default=0)
+    serialization.set_defaults(func=bench_serialization)
+
+    solver = subparsers.add_parser("solver", help="dfs_scheduling / scheduleMaximizer on synthetic workloads")
+    solver.add_argument("cases", nargs="*", help=f"cases to run (default: all of {', '.join(SOLVER_CASES)})")
+    solver.add_argument("--repeats", type=int, default=3)
+    solver.add_argument("--seed", type=int, default=0)
+    solver.add_argument("--tolerance", type=float, default=0.5, help="allowed relative slowdown (0.5 = 50%%)")
+    solver.add_argument("--baseline", default=BASELINE_FILE)
+    solver.add_argument("--save-baseline", action="store_true")
+    solver.set_defaults(func=bench_solver)
+
+    validation = subparsers.add_parser("validation", help="schedule_validator on a solved synthetic schedule")
+    validation.add_argument("--employees", type=int, default=150)
+    validation.add_argument("--shifts", type=int, default=4)
+    validation.add_argument("--days", type=int, default=56)
+    validation.add_argument("--slack", type=int, default=10)
+    validation.add_argument("--repeats", type=int, default=20)
+    validation.add_argument("--seed", type=int, default=0)
+    validation.set_defaults(func=bench_validation)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
@@ -0,0 +1,82 @@
+import os
+import threading
+import alg_helper
+
+"""
+Holiday calendars used by the scheduler.
+
+The "default" calendar is statHolidays.csv. Extra regions are read from <HOLIDAY_DIR>/<region>.csv
+(same "date,name" rows). Nothing is read at import: each calendar is loaded on first use and indexed
+by date string. A cached calendar is re-read when its file's modification time changes, so edited or newly
+added files are picked up without a restart by every process (uvicorn workers, scenario workers), not just
+the one that handles /reload_holidays.
+"""
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_REGION = "default"
+DEFAULT_FILE = os.path.join(BASE_DIR, "statHolidays.csv")
+HOLIDAY_DIR = os.getenv("HOLIDAY_DIR", os.path.join(BASE_DIR, "holidays"))
+
+_calendars = {} # {region: (file mtime or None, {"2025-07-01": "Canada Day"})}
+_lock = threading.Lock()
+
+
+"""
+Returns the CSV path for a region, or None if the region has no file.
+"""
+def region_file(region):
+    path = DEFAULT_FILE if region == DEFAULT_REGION else os.path.join(HOLIDAY_DIR, f"{region}.csv")
+    return path if os.path.isfile(path) else None
+
+"""
+Lists the regions that can be assigned to an account.
+"""
+def available_regions():
+    regions = [DEFAULT_REGION]
+    if os.path.isdir(HOLIDAY_DIR):
+        regions += sorted(name[:-4] for name in os.listdir(HOLIDAY_DIR) if name.endswith(".csv"))
+    return regions
+
+"""
+Returns the {date_str: name} index for a region, loading it on first use and again whenever the file's
+mtime changes (one stat per call). Unknown regions are empty.
+"""
+def get_calendar(region=DEFAULT_REGION):
+    path = region_file(region)
+    try:
+        mtime = os.path.getmtime(path) if path else None
+    except OSError: # Removed since region_file looked
+        path = mtime = None
+    cached = _calendars.get(region)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with _lock:
+        cached = _calendars.get(region)
+        if cached is None or cached[0] != mtime:
+            calendar = {}
+            if path:
+                try:
+                    calendar = {date_str: name for date_str, name in alg_helper.read_holidays(path)}
+                except (OSError, UnicodeDecodeError) as err:
+                    # Removed or unreadable mid-edit; the next call retries since the mtime won't match
+                    print(f"WARNING: could not read holiday calendar {path}: {err}")
+                    mtime = None
+            cached = _calendars[region] = (mtime, calendar)
+        return cached[1]
+
+"""
+Drops every loaded calendar in this process so the next lookup re-reads the files (e.g. after a file is
+replaced with one carrying an older mtime). Returns the regions now available.
+"""
+def reload():
+    with _lock:
+        _calendars.clear()
+    return available_regions()
+
+"""
+Precomputes, once per solve, whether each day in the horizon is a holiday in any of the regions.
+Returns a list of bools aligned with day_indices.
+"""
+def holiday_mask(day_indices, regions=None):
+    calendars = [get_calendar(region) for region in regions or [DEFAULT_REGION]]
+    return [any(date_str in calendar for calendar in calendars) for date_str in day_indices]
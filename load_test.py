@@ -0,0 +1,370 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+"""
+Launches `uvicorn main:app` as a separate process against the given SQLite file and waits until it answers.
+Used by the load tests so the client threads don't share a GIL with the server.
+"""
+def spawn_server(port, database_path, workers, ready_path="/metrics"):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{database_path}")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env)
+
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            send(base_url, "GET", ready_path)
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"uvicorn did not start on port {port}")
+
+"""
+Sends one request and returns (latency in ms, HTTP status, decoded JSON body or None).
+"""
+def send(base_url, method, path, body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method,
+                                 headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            payload = resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as err:
+        payload = err.read()
+        status = err.code
+    latency_ms = (time.perf_counter() - start) * 1000
+    try:
+        return latency_ms, status, json.loads(payload)
+    except ValueError:
+        return latency_ms, status, None
+
+"""
+Nearest-rank percentile of a list of latencies.
+"""
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+def format_latencies(label, values, elapsed=None):
+    line = (f"{label:<28}{len(values):>7}{percentile(values, 50):>10.1f}"
+            f"{percentile(values, 95):>10.1f}{percentile(values, 99):>10.1f}")
+    if elapsed:
+        line += f"{len(values) / elapsed:>10.1f}"
+    return line
+
+LATENCY_HEADER = f"{'endpoint':<28}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}"
+
+
+"""
+Builds the cheap, unrelated requests probed during a burst: (label, method, path, body factory).
+/convertFromMilitaryTime runs on the anyio threadpool; /add_shift and /add_employee are async endpoints
+doing short database writes, so they show whether sign-ins delay other work queued behind them.
+"""
+def probe_requests(owner_id):
+    counter = iter(range(10 ** 9))
+    return [
+        ("/convertFromMilitaryTime", "POST", "/convertFromMilitaryTime",
+         lambda: {"startTime": "09:00", "endTime": "17:00"}),
+        ("/add_shift", "POST", "/add_shift",
+         lambda: {"owner_id": owner_id, "name": f"Probe shift {next(counter)}", "start": "09:00", "end": "17:00",
+                  "min_emp": 1, "max_emp": 2}),
+        ("/add_employee", "POST", "/add_employee",
+         lambda: {"owner_id": owner_id, "name": f"Probe employee {next(counter)}", "hours_per_week": 40,
+                  "availability": {}}),
+    ]
+
+"""
+Probes the unrelated endpoints in turn until stop is set and returns {label: [latencies]}.
+"""
+def probe_until(base_url, stop, interval, probes):
+    latencies = {label: [] for label, _, _, _ in probes}
+    while not stop.is_set():
+        for label, method, path, body in probes:
+            latency_ms, _, _ = send(base_url, method, path, body())
+            latencies[label].append(latency_ms)
+            time.sleep(interval)
+    return latencies
+
+"""
+Measures the latency of unrelated endpoints at idle and again during a burst of concurrent sign-ins.
+Fails if the tail latency of any of them during the burst grows by more than --max-p99-ratio.
+"""
+def login_burst(args):
+    # Out-of-process server so the burst's client threads don't share a GIL with it and skew the probes
+    database_path = args.database or os.path.join(tempfile.mkdtemp(prefix="schedulemaker-load-"), "load.db")
+    process = spawn_server(args.port, database_path, 1)
+    try:
+        return run_login_burst(args, f"http://127.0.0.1:{args.port}")
+    finally:
+        process.terminate()
+        process.wait()
+
+def run_login_burst(args, base_url):
+
+    send(base_url, "POST", "/createAccount", {"username": "loadtest", "email": "load@test",
+                                               "password": "loadtest", "password_check": "loadtest"})
+    _, _, account = send(base_url, "POST", "/signIn", {"username": "loadtest", "password": "loadtest"})
+    probes = probe_requests(account["accountID"])
+
+    # 1. Baseline: probe alone
+    stop = threading.Event()
+    timer = threading.Timer(args.baseline_seconds, stop.set)
+    timer.start()
+    baseline = probe_until(base_url, stop, args.probe_interval, probes)
+
+    # 2. Burst: probe while the sign-ins run
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as prober:
+        probe_future = prober.submit(probe_until, base_url, stop, args.probe_interval, probes)
+        burst_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            logins = list(pool.map(
+                lambda _: send(base_url, "POST", "/signIn", {"username": "loadtest", "password": "loadtest"})[0],
+                range(args.logins)))
+        burst_elapsed = time.perf_counter() - burst_start
+        stop.set()
+        during_burst = probe_future.result()
+
+    print(LATENCY_HEADER)
+    for label in baseline:
+        print(format_latencies(f"{label} (idle)", baseline[label]))
+        print(format_latencies(f"{label} (burst)", during_burst[label]))
+    print(format_latencies("/signIn", logins, burst_elapsed))
+
+    failed = False
+    for label in baseline:
+        ratio = percentile(during_burst[label], 99) / max(percentile(baseline[label], 99), 1.0)
+        failed = failed or ratio > args.max_p99_ratio
+        print(f"{label} p99 ratio burst/idle: {ratio:.2f} (limit {args.max_p99_ratio})")
+    return 1 if failed else 0
+
+
+
+"""
+Seeds a SQLite database with synthetic accounts through the app's own models.
+Every account gets a roster and shifts from benchmark.synthetic_workload and the same password, so sign-in
+costs a real bcrypt check without hashing once per account. Returns what the traffic mix needs per account.
+"""
+def seed_accounts(database_path, num_accounts, employees, shifts, seed):
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    import bcrypt
+    import benchmark
+    import main
+    from sqlmodel import Session
+
+    main.create_db_and_tables()
+    password_hash = bcrypt.hashpw(SEED_PASSWORD.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+    accounts = []
+    with Session(main.engine) as session:
+        for i in range(num_accounts):
+            account = main.UserAccount(username=f"load{i:05d}", email=f"load{i:05d}@example.com",
+                                       password=password_hash)
+            session.add(account)
+            session.flush()
+
+            _, _, user_emps, user_shifts = benchmark.synthetic_workload(
+                seed + i, employees, shifts, 14, availability=0.9, min_employees=1, slack=2)
+
+            for shift in user_shifts:
+                session.add(main.ShiftRow(accountID=account.accountID, name=shift["shift_name"],
+                                          start_time=shift["start"], end_time=shift["end"],
+                                          min_employees=shift["min_employees"],
+                                          max_employees=shift["max_employees"]))
+
+            employee_ids = []
+            for emp in user_emps:
+                row = main.EmployeeRow(accountID=account.accountID, name=emp["name"],
+                                       hours_per_week=emp["hours_per_week"])
+                session.add(row)
+                session.flush()
+                employee_ids.append(row.employee_id)
+                for shift_name, status in emp["availability"].items():
+                    session.add(main.EmployeeAvailabilityRow(employee_id=row.employee_id,
+                                                             shift_name=shift_name, is_available=status))
+                for start_date, end_date in emp["vacation"]:
+                    session.add(main.EmployeeVacationRow(employee_id=row.employee_id,
+                                                         start_date=start_date, end_date=end_date))
+
+            accounts.append({
+                "id": account.accountID,
+                "username": account.username,
+                "employee_ids": employee_ids,
+                "shift_names": [shift["shift_name"] for shift in user_shifts]
+            })
+        session.commit()
+    return accounts
+
+SEED_PASSWORD = "loadtest-password"
+
+# Relative weight of each request type in the traffic mix
+TRAFFIC_MIX = {
+    "/signIn": 10,
+    "/view_emps": 35,
+    "/view_shifts": 35,
+    "/update_availability": 15,
+    "/generate": 5
+}
+
+"""
+Builds one request of the given type for an account: (method, path, body).
+"""
+def build_request(kind, account, rng):
+    if kind == "/signIn":
+        return "POST", "/signIn", {"username": account["username"], "password": SEED_PASSWORD}
+    if kind == "/view_emps":
+        return "GET", f"/view_emps/{account['id']}", None
+    if kind == "/view_shifts":
+        return "GET", f"/view_shifts/{account['id']}", None
+    if kind == "/update_availability":
+        emp_id = rng.choice(account["employee_ids"])
+        # Mostly available, so /generate stays feasible for the account
+        availability = {name: int(rng.random() < 0.9) for name in account["shift_names"]}
+        return "POST", "/update_availability", {"updates": {str(emp_id): {"availability": availability}}}
+    return "POST", "/generate", {"owner_id": account["id"], "start_date": "2025-03-03",
+                                 "num_days": 14, "format": "compact"}
+
+"""
+One virtual user: picks a random account and request type per iteration until the deadline.
+Returns {endpoint: [latencies]} and {endpoint: error count}.
+"""
+def virtual_user(base_url, accounts, deadline, seed, think_time):
+    rng = random.Random(seed)
+    kinds = list(TRAFFIC_MIX)
+    weights = [TRAFFIC_MIX[kind] for kind in kinds]
+    latencies = {kind: [] for kind in kinds}
+    errors = {kind: 0 for kind in kinds}
+
+    while time.perf_counter() < deadline:
+        kind = rng.choices(kinds, weights)[0]
+        method, path, body = build_request(kind, rng.choice(accounts), rng)
+        try:
+            latency_ms, status, payload = send(base_url, method, path, body)
+        except OSError:
+            errors[kind] += 1
+            continue
+        latencies[kind].append(latency_ms)
+        if status != 200 or (isinstance(payload, dict) and payload.get("status") == "error"):
+            errors[kind] += 1
+        if think_time:
+            time.sleep(rng.uniform(0, think_time))
+    return latencies, errors
+
+"""
+Seeds a fresh SQLite database, starts uvicorn (or targets --url) and drives the traffic mix with
+--users concurrent virtual users for --duration seconds. Reports p50/p95/p99 and throughput per endpoint.
+"""
+def traffic_mix(args):
+    database_path = args.database or os.path.join(tempfile.mkdtemp(prefix="schedulemaker-load-"), "load.db")
+    seed_start = time.perf_counter()
+    accounts = seed_accounts(database_path, args.accounts, args.employees, args.shifts, args.seed)
+    print(f"Seeded {len(accounts)} accounts into {database_path} in {time.perf_counter() - seed_start:.1f}s")
+
+    process = None
+    base_url = args.url
+    if base_url is None:
+        process = spawn_server(args.port, database_path, args.workers)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        run_start = time.perf_counter()
+        deadline = run_start + args.duration
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            futures = [pool.submit(virtual_user, base_url, accounts, deadline, args.seed + i, args.think_time)
+                       for i in range(args.users)]
+            results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - run_start
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    all_latencies = []
+    total_errors = 0
+    print(LATENCY_HEADER + f"{'errors':>8}")
+    for kind in TRAFFIC_MIX:
+        latencies = [ms for result in results for ms in result[0][kind]]
+        kind_errors = sum(result[1][kind] for result in results)
+        all_latencies.extend(latencies)
+        total_errors += kind_errors
+        print(format_latencies(kind, latencies, elapsed) + f"{kind_errors:>8}")
+    print(format_latencies("all", all_latencies, elapsed) + f"{total_errors:>8}")
+    return 1 if total_errors else 0
+
+
+"""
+Measures time from launching uvicorn to the first successful response on /, for a first boot
+(empty database, schema gets created) and a restart on the same database (schema check skipped).
+Fails if either exceeds --budget seconds.
+"""
+def cold_start(args):
+    database_path = args.database or os.path.join(tempfile.mkdtemp(prefix="schedulemaker-load-"), "load.db")
+    failed = False
+    for label in ("first boot", "restart"):
+        times = []
+        for _ in range(args.runs):
+            launch = time.perf_counter()
+            process = spawn_server(args.port, database_path, 1, ready_path="/")
+            times.append(time.perf_counter() - launch)
+            process.terminate()
+            process.wait()
+            if label == "first boot":
+                break # Only the very first launch sees an empty database
+        worst = max(times)
+        failed = failed or worst > args.budget
+        print(f"{label:<12} time to first response: {worst * 1000:.0f}ms (worst of {len(times)}, budget {args.budget * 1000:.0f}ms)")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ScheduleMaker HTTP load tests")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--database", default=None, help="SQLite file to use (default: fresh temp file)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    burst = subparsers.add_parser("login-burst", help="unrelated endpoint latency during a sign-in burst")
+    burst.add_argument("--logins", type=int, default=40)
+    burst.add_argument("--concurrency", type=int, default=20)
+    burst.add_argument("--baseline-seconds", type=float, default=2.0)
+    burst.add_argument("--probe-interval", type=float, default=0.01)
+    burst.add_argument("--max-p99-ratio", type=float, default=3.0)
+    burst.set_defaults(func=login_burst)
+
+    mix = subparsers.add_parser("mix", help="seeded multi-account traffic mix against uvicorn")
+    mix.add_argument("--accounts", type=int, default=50)
+    mix.add_argument("--employees", type=int, default=15, help="employees per account")
+    mix.add_argument("--shifts", type=int, default=3, help="shifts per account")
+    mix.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    mix.add_argument("--duration", type=float, default=30.0, help="seconds of traffic")
+    mix.add_argument("--think-time", type=float, default=0.0, help="max random pause between requests (s)")
+    mix.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    mix.add_argument("--url", default=None, help="target an already running server (must use --database)")
+    mix.add_argument("--seed", type=int, default=0)
+    mix.set_defaults(func=traffic_mix)
+
+    cold = subparsers.add_parser("cold-start", help="time from launching uvicorn to the first response")
+    cold.add_argument("--runs", type=int, default=3, help="restarts to measure")
+    cold.add_argument("--budget", type=float, default=3.0, help="seconds allowed to the first response")
+    cold.set_defaults(func=cold_start)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
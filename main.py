@@ -1,15 +1,29 @@
 import time
+startup_timings = {"start": time.perf_counter()} # Cold-start breakdown, reported once startup completes
+import json
+import threading
+import hashlib
 from datetime import datetime, timedelta
-import DFS_algorithm
+import alg_helper
+import holiday_calendar
 import os
+import asyncio
 import bcrypt
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 from fastapi import FastAPI, Response, Cookie
 from pydantic import BaseModel
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from sqlmodel import Field, SQLModel, Session, create_engine, select
 from contextlib import asynccontextmanager
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.exc import SQLAlchemyError
+
+# The solver side (DFS_algorithm, schedule_validator, scenarios, the process pool) is imported
+# on first use, so a cold start only pays for the web framework and the database models.
+startup_timings["imports"] = time.perf_counter()
 
 
 """DATABASE SECTION"""
@@ -51,6 +65,37 @@ class EmployeeVacationRow(SQLModel, table=True):
     start_date: str # "2026-06-01"
     end_date: str   
 
+# 6. Child Table: Holiday calendars (regions) applied to an account. No rows means the default calendar.
+class AccountHolidayCalendarRow(SQLModel, table=True):
+    calendar_id: Optional[int] = Field(default=None, primary_key=True)
+    accountID: int = Field(foreign_key="useraccount.accountID") # Maps back to the User table
+    region: str # Matches a file in holiday_calendar.HOLIDAY_DIR, or "default" for statHolidays.csv
+
+# 7. Hours ledger: hours worked per employee per ISO week, kept across runs.
+#    day_hours is a JSON list of 7 floats (Monday first) so re-committing part of a week replaces just those days.
+class EmployeeHoursLedgerRow(SQLModel, table=True):
+    # One row per employee and week, so concurrent commits upsert the same row instead of adding a second one
+    __table_args__ = (UniqueConstraint("accountID", "employee_id", "iso_week", name="uq_hours_ledger_week"),)
+    ledger_id: Optional[int] = Field(default=None, primary_key=True)
+    accountID: int = Field(foreign_key="useraccount.accountID", index=True) # Maps back to the User table
+    employee_id: int = Field(foreign_key="employeerow.employee_id", index=True) # Connects directly to parent employee
+    iso_week: str = Field(index=True) # "2025-W27"
+    hours: float = 0.0 # Total of day_hours
+    day_hours: str = "[0, 0, 0, 0, 0, 0, 0]"
+
+# 8. Last committed schedule of an account (compact format), the default warm-start hint for the next period
+class CommittedScheduleRow(SQLModel, table=True):
+    schedule_id: Optional[int] = Field(default=None, primary_key=True)
+    accountID: int = Field(foreign_key="useraccount.accountID", unique=True) # Maps back to the User table; one row per account
+    start_date: str
+    num_days: int
+    schedule: str # JSON of alg_helper.compact_schedule
+
+# 9. Schema fingerprint of the tables above, so startup can skip create_all when nothing changed
+class SchemaVersionRow(SQLModel, table=True):
+    schema_id: Optional[int] = Field(default=None, primary_key=True)
+    fingerprint: str
+
 # Fetch DATABASE_URL from Render env variables. Fallback to local SQLite for local testing!
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///database.db")
 
@@ -61,13 +106,58 @@ if DATABASE_URL.startswith("postgres://"):
 # Connect to SQLite locally or PostgreSQL on Render
 connect_args = {"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
 engine = create_engine(DATABASE_URL, connect_args=connect_args)
-if "sqlite" in DATABASE_URL:
-    print("--> Using LOCAL SQLite Database")
-else:
-    print("--> Using RENDER PostgreSQL Database")
+DATABASE_LABEL = "LOCAL SQLite" if "sqlite" in DATABASE_URL else "RENDER PostgreSQL"
+startup_timings["engine"] = time.perf_counter()
 
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        row = session.exec(select(SchemaVersionRow)).first() or SchemaVersionRow()
+        row.fingerprint = schema_fingerprint()
+        session.add(row)
+        session.commit()
+
+"""
+Hashes every table, column and column type, so any model change produces a new fingerprint.
+"""
+def schema_fingerprint():
+    parts = []
+    for table in SQLModel.metadata.sorted_tables:
+        for column in table.columns:
+            parts.append(f"{table.name}.{column.name}:{column.type}:{column.nullable}:{column.primary_key}")
+    return hashlib.sha1("\n".join(sorted(parts)).encode("utf-8")).hexdigest()
+
+"""
+Runs create_all only when the stored fingerprint is missing or differs from the models.
+Returns True if the schema was (re)created.
+"""
+def ensure_schema():
+    try:
+        with Session(engine) as session:
+            row = session.exec(select(SchemaVersionRow)).first()
+            if row and row.fingerprint == schema_fingerprint():
+                return False
+    except SQLAlchemyError:
+        pass # No schemaversionrow table yet
+    create_db_and_tables()
+    return True
+
+# Bounded pools for blocking work called from async endpoints, so a burst of logins can't stall the event loop
+# or flood the database with connections. bcrypt gets its own pool: queued password checks must not delay
+# the short database work (inserts, lookups) of unrelated requests. bcrypt is CPU bound, so by default it
+# leaves one core for everything else; more threads than cores add no login throughput.
+BLOCKING_WORKERS = int(os.getenv("BLOCKING_WORKERS", "4"))
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(max(1, min(4, (os.cpu_count() or 1) - 1)))))
+blocking_executor = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix="blocking")
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_WORKERS, thread_name_prefix="bcrypt")
+
+"""
+Runs a blocking function on a bounded executor (the database pool by default) and awaits its result
+without blocking the event loop.
+"""
+async def run_blocking(func, *args, executor=None):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or blocking_executor, func, *args)
 
 
 
@@ -78,12 +168,37 @@ Handles all web requests, user authentication, and the scheduling algorithm.
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Everything before 'yield' runs on application startup
-    SQLModel.metadata.create_all(engine)
+    schema_start = time.perf_counter()
+    schema_created = await run_blocking(ensure_schema)
+    schema_ms = (time.perf_counter() - schema_start) * 1000
+    print(startup_report(schema_ms, schema_created))
     yield
     # Everything after 'yield' runs on shutdown (if needed)
+    await run_blocking(shutdown_scenario_pool)
+
+"""
+Formats the cold-start timing breakdown printed once the app is ready to serve.
+"""
+def startup_report(schema_ms, schema_created):
+    marks = startup_timings
+    imports_ms = (marks["imports"] - marks["start"]) * 1000
+    engine_ms = (marks["engine"] - marks["imports"]) * 1000
+    app_ms = (marks["app"] - marks["engine"]) * 1000
+    total_ms = (time.perf_counter() - marks["start"]) * 1000
+    schema_note = "created/updated" if schema_created else "up to date, skipped"
+    return (f"--> Using {DATABASE_LABEL} Database. Startup {total_ms:.0f}ms: imports {imports_ms:.0f}ms, "
+            f"engine {engine_ms:.0f}ms, app {app_ms:.0f}ms, schema {schema_ms:.0f}ms ({schema_note})")
 
 app = FastAPI(lifespan=lifespan)
 
+# Compress large responses (mainly /generate). Brotli is used when the optional
+# brotli-asgi package is installed, and it falls back to gzip for clients without 'br'.
+try:
+    from brotli_asgi import BrotliMiddleware
+    app.add_middleware(BrotliMiddleware, minimum_size=1000, gzip_fallback=True)
+except ImportError:
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 
 
 """
@@ -93,14 +208,256 @@ class ScheduleParams(BaseModel):
     owner_id: int
     start_date: str
     num_days: int
+    format: str = "nested" # "nested" {date: {shift: [names]}} or "compact" name table + index arrays
+    commit_hours: bool = False # Record the result's hours in the ledger so later runs build on them
+    fairness_weeks: int = Field(default=0, ge=0, le=52) # Weeks of ledger history the maximizer's fairness sort takes into account
+    warm_start: bool = False # Seed the search from the last committed schedule (commit_hours saves it)
+    hint_schedule: Optional[Dict[str, Any]] = None # Uploaded prior schedule (nested or compact) to seed from instead
 
 @app.post("/generate")
 def generate(params: ScheduleParams):
-    result = generate_schedule(params.start_date, params.num_days, params.owner_id)
+    if params.format not in ("nested", "compact"):
+        return {"status": "error", "message": f"Unknown schedule format: {params.format}"}
+
+    metrics = {"timings": {}, "search": alg_helper.new_search_stats()}
+    result = generate_schedule(params.start_date, params.num_days, params.owner_id, metrics,
+                               params.commit_hours, params.fairness_weeks, params.warm_start, params.hint_schedule)
     if "error" in result:
+        record_generate_metrics(metrics, success=False)
         return {"status": "error", "message": result["error"]}
+
+    # Encode the schedule here rather than in FastAPI so the serialization time can be reported
+    serialize_start = time.perf_counter()
+    schedule = result.pop("schedule")
+    if params.format == "compact":
+        schedule = alg_helper.compact_schedule(schedule)
+    schedule_json = json.dumps(schedule)
+    metrics["timings"]["serialize"] = round(time.perf_counter() - serialize_start, 4)
+
+    result["format"] = params.format
+    result["metrics"] = metrics
+    record_generate_metrics(metrics, success=True)
+
+    # Splice the already encoded schedule into the envelope instead of encoding it twice
+    body = json.dumps(result)[:-1] + ', "schedule": ' + schedule_json + '}'
+    return Response(content=body, media_type="application/json")
+
+
+"""
+Validates and scores a (hand edited) schedule in the /generate output shape without re-running the solver.
+"""
+class ValidateParams(BaseModel):
+    owner_id: int
+    schedule: Dict[str, Any]
+    format: str = "nested" # Same formats as /generate
+
+@app.post("/validate_schedule")
+def validate_schedule(params: ValidateParams):
+    if params.format not in ("nested", "compact"):
+        return {"status": "error", "message": f"Unknown schedule format: {params.format}"}
+
+    # runtime covers the whole request (what the UI waits for); db_load is the part spent loading the account
+    start_time = time.perf_counter()
+    user_shifts, user_emps, holiday_regions = load_schedule_inputs(params.owner_id)
+    if not user_shifts or not user_emps:
+        return {"status": "error", "message": "No shifts or employees to validate against."}
+    db_load_seconds = time.perf_counter() - start_time
+
+    import schedule_validator
+
+    try:
+        schedule = alg_helper.expand_schedule(params.schedule) if params.format == "compact" else params.schedule
+    except (KeyError, IndexError, TypeError, ValueError) as err:
+        return {"status": "error", "message": f"Malformed schedule: {err}"}
+    shape_error = alg_helper.schedule_shape_error(schedule)
+    if shape_error:
+        return {"status": "error", "message": f"Malformed schedule: {shape_error}"}
+    # Hours already committed on the other days of the schedule's weeks count toward the weekly caps, as in the solver
+    ledger_start = time.perf_counter()
+    with Session(engine) as session:
+        carried_hours = load_hours_ledger(session, params.owner_id, sorted(schedule))["week_hours"]
+    db_load_seconds += time.perf_counter() - ledger_start
+    result = schedule_validator.validate_schedule(schedule, user_emps, user_shifts, holiday_regions, carried_hours)
+    result["db_load"] = round(db_load_seconds, 4)
+    result["runtime"] = round(time.perf_counter() - start_time, 4)
+    result["status"] = "success"
     return result
 
+
+"""
+Compares what-if variants of an account's rules (e.g. more staff on weekends, capped part-timer hours,
+someone on vacation) without touching the database. Inputs are loaded and compiled once, then every
+variant is solved in parallel on a process pool. See scenarios.py for the override types.
+"""
+class ScenarioVariant(BaseModel):
+    name: str
+    overrides: List[Dict[str, Any]] = []
+
+class ScenarioParams(BaseModel):
+    owner_id: int
+    start_date: str
+    num_days: int
+    scenarios: List[ScenarioVariant]
+    include_base: bool = True # Prepend an unmodified "base" row to compare against
+    node_limit: int = 200000  # Per-variant DFS budget so one hopeless variant can't pin a worker
+
+SCENARIO_WORKERS = int(os.getenv("SCENARIO_WORKERS", str(os.cpu_count() or 2)))
+scenario_pool = None
+scenario_pool_lock = threading.Lock()
+
+"""
+Returns the shared process pool, created on first use. Workers are started from a forkserver rather than
+forked from the multi-threaded server process, which can deadlock on locks held by other threads.
+"""
+def get_scenario_pool():
+    global scenario_pool
+    with scenario_pool_lock:
+        if scenario_pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            scenario_pool = ProcessPoolExecutor(max_workers=SCENARIO_WORKERS,
+                                                mp_context=multiprocessing.get_context("forkserver"))
+        return scenario_pool
+
+"""
+Stops the scenario workers on shutdown (they would otherwise outlive the server). The pool is recreated on next use.
+"""
+def shutdown_scenario_pool():
+    global scenario_pool
+    with scenario_pool_lock:
+        if scenario_pool is not None:
+            scenario_pool.shutdown(cancel_futures=True)
+            scenario_pool = None
+
+@app.post("/scenarios")
+def run_scenarios(params: ScenarioParams):
+    try:
+        start_date = datetime.strptime(params.start_date, "%Y-%m-%d")
+    except ValueError:
+        return {"status": "error", "message": "Invalid date format. Use YYYY-MM-DD."}
+
+    user_shifts, user_emps, holiday_regions = load_schedule_inputs(params.owner_id)
+    if not user_shifts or not user_emps:
+        return {"status": "error", "message": "No shifts or employees to schedule."}
+    compiled = compile_schedule_problem(start_date, params.num_days, holiday_regions)
+    # Same weekly caps as /generate: hours already committed on the other days of the horizon's weeks count
+    with Session(engine) as session:
+        hours_ledger = load_hours_ledger(session, params.owner_id, compiled["day_indices"])
+
+    variants = list(params.scenarios)
+    if params.include_base:
+        variants.insert(0, ScenarioVariant(name="base"))
+
+    start_time = time.perf_counter()
+    pool = get_scenario_pool()
+    futures = [
+        pool.submit(solve_scenario, start_date, params.num_days, user_emps, user_shifts,
+                    holiday_regions, compiled, variant.overrides, params.node_limit, hours_ledger)
+        for variant in variants
+    ]
+    rows = []
+    for variant, future in zip(variants, futures):
+        row = {"name": variant.name}
+        row.update(future.result())
+        rows.append(row)
+
+    return {"status": "success", "runtime": round(time.perf_counter() - start_time, 4), "scenarios": rows}
+
+"""
+Solves one scenario variant (runs in a worker process) and returns its comparison row.
+"""
+def solve_scenario(start_date, num_days, user_emps, user_shifts, holiday_regions, compiled, overrides, node_limit, hours_ledger=None):
+    import scenarios
+    import schedule_validator
+
+    try:
+        user_emps, user_shifts = scenarios.apply_overrides(user_emps, user_shifts, overrides)
+    except (KeyError, TypeError, ValueError) as err:
+        return {"feasible": False, "error": f"Invalid override: {err}"}
+
+    metrics = {"timings": {}, "search": alg_helper.new_search_stats(node_limit)}
+    schedule = dfs_schedule_helper(start_date, num_days, user_emps, user_shifts, metrics, holiday_regions, compiled, hours_ledger)
+    search = metrics["search"]
+    row = {
+        "feasible": schedule is not None,
+        "budget_exhausted": search["nodes_expanded"] > node_limit,
+        "solver_time": round(metrics["timings"].get("dfs", 0) + metrics["timings"].get("maximizer", 0), 4),
+        "nodes_expanded": search["nodes_expanded"],
+        "backtracks": search["backtracks"]
+    }
+    if schedule is not None:
+        # Score against the holidays the variant was solved with, not the worker's own calendar cache
+        scores = schedule_validator.validate_schedule(schedule, user_emps, user_shifts,
+                                                      holiday_mask=compiled["holiday_mask"])["scores"]
+        row.update({
+            "min_coverage": scores["min_coverage"],
+            "max_fill": scores["max_fill"],
+            "fairness": scores["fairness"],
+            "total_hours": scores["total_hours"]
+        })
+    return row
+
+
+"""METRICS SECTION"""
+# Running totals across /generate calls, exposed in Prometheus text format on /metrics
+SOLVER_PHASES = ("db_load", "compile", "dfs", "maximizer", "serialize")
+metrics_lock = threading.Lock()
+metrics_totals = {
+    "generate_requests": {"success": 0, "error": 0},
+    "phase_seconds": {phase: 0.0 for phase in SOLVER_PHASES},
+    "phase_count": {phase: 0 for phase in SOLVER_PHASES},
+    "search": alg_helper.new_search_stats() # max_depth holds the last solve's value, the rest are totals
+}
+
+"""
+Adds the timings and search counters of one /generate call to the running totals.
+"""
+def record_generate_metrics(metrics, success):
+    with metrics_lock:
+        metrics_totals["generate_requests"]["success" if success else "error"] += 1
+        for phase, seconds in metrics["timings"].items():
+            metrics_totals["phase_seconds"][phase] += seconds
+            metrics_totals["phase_count"][phase] += 1
+        for counter in ("nodes_expanded", "backtracks", "slots_filled"):
+            metrics_totals["search"][counter] += metrics["search"][counter]
+        if "dfs" in metrics["timings"]:
+            metrics_totals["search"]["max_depth"] = metrics["search"]["max_depth"]
+
+"""
+Exposes solver timings and search counters in the Prometheus text exposition format.
+"""
+@app.get("/metrics")
+def get_metrics():
+    with metrics_lock:
+        lines = [
+            "# HELP schedulemaker_generate_requests_total /generate calls by outcome.",
+            "# TYPE schedulemaker_generate_requests_total counter"
+        ]
+        for outcome, count in metrics_totals["generate_requests"].items():
+            lines.append(f'schedulemaker_generate_requests_total{{outcome="{outcome}"}} {count}')
+
+        lines.append("# HELP schedulemaker_phase_seconds Time spent per /generate phase.")
+        lines.append("# TYPE schedulemaker_phase_seconds summary")
+        for phase in SOLVER_PHASES:
+            lines.append(f'schedulemaker_phase_seconds_sum{{phase="{phase}"}} {metrics_totals["phase_seconds"][phase]:.6f}')
+            lines.append(f'schedulemaker_phase_seconds_count{{phase="{phase}"}} {metrics_totals["phase_count"][phase]}')
+
+        search = metrics_totals["search"]
+        for name, help_text, value in (
+            ("dfs_nodes_expanded_total", "DFS nodes expanded.", search["nodes_expanded"]),
+            ("dfs_backtracks_total", "DFS assignments undone.", search["backtracks"]),
+            ("maximizer_slots_filled_total", "Extra slots filled by the maximizer.", search["slots_filled"])
+        ):
+            lines.append(f"# HELP schedulemaker_{name} {help_text}")
+            lines.append(f"# TYPE schedulemaker_{name} counter")
+            lines.append(f"schedulemaker_{name} {value}")
+
+        lines.append("# HELP schedulemaker_dfs_max_depth Deepest DFS recursion of the last solve.")
+        lines.append("# TYPE schedulemaker_dfs_max_depth gauge")
+        lines.append(f"schedulemaker_dfs_max_depth {search['max_depth']}")
+
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
 """
 Returns a list of employees that belong specifically to the logged-in user.
 """
@@ -230,6 +587,10 @@ async def add_employee(emp_data: EmployeeInfo, userID: Optional[str] = Cookie(No
     if not owner_id:
         return {"status": "error", "message": "Authentication cookie missing. Please log in again."}
 
+    await run_blocking(insert_employee, owner_id, emp_data)
+    return {"status": "success"}
+
+def insert_employee(owner_id: int, emp_data: EmployeeInfo):
     with Session(engine) as session:
         new_emp = EmployeeRow(
             accountID=owner_id, 
@@ -254,7 +615,6 @@ async def add_employee(emp_data: EmployeeInfo, userID: Optional[str] = Cookie(No
                 )
                 session.add(new_avail)
         session.commit()
-    return {"status": "success"}
 
 
 """
@@ -286,6 +646,10 @@ def remove_emp(param: EmpID):
             vac_statement = select(EmployeeVacationRow).where(EmployeeVacationRow.employee_id == param.emp_id)
             for row in session.exec(vac_statement).all():
                 session.delete(row)
+
+            ledger_statement = select(EmployeeHoursLedgerRow).where(EmployeeHoursLedgerRow.employee_id == param.emp_id)
+            for row in session.exec(ledger_statement).all():
+                session.delete(row)
                 
             # 3. Delete the parent employee row
             session.delete(employee)
@@ -314,6 +678,10 @@ async def add_shift(shift_data: ShiftInfo, userID: Optional[str] = Cookie(None))
     if not owner_id:
         return {"status": "error", "message": "Authentication cookie missing. Please log in again."}
 
+    await run_blocking(insert_shift, owner_id, shift_data)
+    return {"status": "success"}
+
+def insert_shift(owner_id: int, shift_data: ShiftInfo):
     with Session(engine) as session:
         new_shift = ShiftRow(
             accountID=owner_id,
@@ -325,7 +693,6 @@ async def add_shift(shift_data: ShiftInfo, userID: Optional[str] = Cookie(None))
         )
         session.add(new_shift)
         session.commit()
-    return {"status": "success"}
 
 """
 Deletes a shift and automatically cleans it out of every employee's availability.
@@ -457,6 +824,47 @@ def delete_vacation(param: VacationInfo):
     return {"status": "error", "message": "Vacation record not found."}
 
 
+"""
+Lists the holiday calendars an account can use and the ones currently applied to it.
+"""
+@app.get("/holiday_calendars/{user_id}")
+def get_holiday_calendars(user_id: int):
+    with Session(engine) as session:
+        regions = load_holiday_regions(session, user_id)
+    return {"status": "success", "available": holiday_calendar.available_regions(), "selected": regions}
+
+"""
+Replaces the set of holiday calendars applied to an account.
+"""
+class HolidayCalendarInfo(BaseModel):
+    owner_id: int
+    regions: List[str]
+
+@app.post("/set_holiday_calendars")
+def set_holiday_calendars(param: HolidayCalendarInfo):
+    available = holiday_calendar.available_regions()
+    unknown = [region for region in param.regions if region not in available]
+    if unknown:
+        return {"status": "error", "message": f"Unknown holiday calendar(s): {', '.join(unknown)}"}
+
+    with Session(engine) as session:
+        statement = select(AccountHolidayCalendarRow).where(AccountHolidayCalendarRow.accountID == param.owner_id)
+        for row in session.exec(statement).all():
+            session.delete(row)
+        for region in dict.fromkeys(param.regions):
+            session.add(AccountHolidayCalendarRow(accountID=param.owner_id, region=region))
+        session.commit()
+    return {"status": "success"}
+
+"""
+Re-reads the holiday CSV files in this process and lists the available regions. Edited or new files are
+also picked up on their own (by mtime) in every process, so this is only needed to force a re-read.
+"""
+@app.post("/reload_holidays")
+def reload_holidays():
+    return {"status": "success", "available": holiday_calendar.reload()}
+
+
 """SIGN-IN/ACCOUNT INFO"""
 
 """
@@ -468,23 +876,34 @@ class AccountInfo(BaseModel):
 
 @app.post("/signIn")
 async def sign_in(account_data: AccountInfo, response: Response): # Add response here
-    with Session(engine) as session:
-        statement = select(UserAccount).where(UserAccount.username == account_data.username)
-        user = session.exec(statement).first()
+    user = await run_blocking(find_account, account_data.username)
+    if user and not await run_blocking(check_password, account_data.password, user.password, executor=password_executor):
+        user = None
+    
+    if user:
+        # Set a session cookie containing the user's account ID
+        response.set_cookie(key="userID",value=str(user.accountID), path="/")
+        return {
+            "status": "success", 
+            "accountID": user.accountID, 
+            "username": user.username
+            }
         
-        if user:
-            entered_password = account_data.password.encode('utf-8')
-            stored_password = user.password.encode('utf-8')
-            if bcrypt.checkpw(entered_password, stored_password):
-                # Set a session cookie containing the user's account ID
-                response.set_cookie(key="userID",value=str(user.accountID), path="/")
-                return {
-                    "status": "success", 
-                    "accountID": user.accountID, 
-                    "username": user.username
-                    }
-            
-        return {"status": "error", "message": "Invalid username or password."}
+    return {"status": "error", "message": "Invalid username or password."}
+
+"""
+Looks up an account by username. Returns the account or None.
+"""
+def find_account(username: str):
+    with Session(engine) as session:
+        statement = select(UserAccount).where(UserAccount.username == username)
+        return session.exec(statement).first()
+
+"""
+Runs the (slow, blocking) bcrypt check of an entered password against the stored hash.
+"""
+def check_password(password: str, stored_hash: str):
+    return bcrypt.checkpw(password.encode('utf-8'), stored_hash.encode('utf-8'))
 
 """
 Registers a new user and saves their credentials to the database.
@@ -548,47 +967,257 @@ def convertFromMilitaryTime(param: ShiftTime):
     
 
 
+"""
+Builds the parts of a solve that only depend on the horizon and holiday calendars, so several
+variants of the same problem (see /scenarios) can share them: the day list and the holiday mask.
+"""
+def compile_schedule_problem(start_date, num_days, holiday_regions=None):
+    day_indices = [(start_date + timedelta(days=day)).strftime('%Y-%m-%d') for day in range(num_days)]
+    return {
+        "day_indices": day_indices,
+        # Holidays for the whole horizon, looked up once instead of on every DFS visit
+        "holiday_mask": holiday_calendar.holiday_mask(day_indices, holiday_regions),
+        # ISO week of each day, the key of the hours ledger
+        "week_keys": alg_helper.week_keys(day_indices)
+    }
+
 """
 Sets up the logic and data structures needed for the algorithm to run the schedule.
 """
-def dfs_schedule_helper(start_date, num_days, user_employees, user_shifts):
+def dfs_schedule_helper(start_date, num_days, user_employees, user_shifts, metrics=None, holiday_regions=None, compiled=None, hours_ledger=None, hint_schedule=None):
     if not user_shifts or not user_employees: 
         return None
 
-    schedule = {}
-    day_indices = []
-    
+    if metrics is None:
+        metrics = {"timings": {}, "search": alg_helper.new_search_stats()}
+    timings = metrics["timings"]
+    stats = metrics["search"]
+
+    compile_start = time.perf_counter()
+    if compiled is None:
+        compiled = compile_schedule_problem(start_date, num_days, holiday_regions)
+    day_indices = compiled["day_indices"]
+    holiday_mask = compiled["holiday_mask"]
+    week_keys = compiled["week_keys"]
+    if hours_ledger is None:
+        hours_ledger = {"week_hours": {}, "past_hours": {}}
+
     # Initialize the schedule structure
-    for day in range(num_days):
-        current_date = start_date + timedelta(days=day)
-        date_str = current_date.strftime('%Y-%m-%d')
+    schedule = {}
+    for date_str in day_indices:
         schedule[date_str] = {}
-        day_indices.append(date_str)
         for shift in user_shifts:
             schedule[date_str][shift['shift_name']] = [] 
             
-    # Create employee hour tracker {emp_id: {'current_hours': 0}}
+    # Create employee hour tracker {emp_id: {"2025-W27": hours}}, seeded with hours already in the ledger
     employee_hours = {
-        emp['id']: {'current_hours': 0, 'max_hours': emp['hours_per_week']}
+        emp['id']: dict(hours_ledger["week_hours"].get(emp['id'], {}))
         for emp in user_employees
     }
+
+    # Warm start: per-slot try order with the prior schedule's employees first
+    hints = slot_candidates = None
+    if hint_schedule:
+        hints, slot_candidates = compile_hints(day_indices, holiday_mask, hint_schedule, user_employees, user_shifts, stats)
+    timings["compile"] = round(timings.get("compile", 0) + time.perf_counter() - compile_start, 4)
+
+    import DFS_algorithm
+
+    alg_helper.trace("\nStarting DFS to generate Schedule...")
     
-    print("\nStarting DFS to generate Schedule...")
-    
-    DFS_success = DFS_algorithm.dfs_scheduling(schedule, employee_hours, day_indices, 0, 0, 0, num_days, user_employees, user_shifts)
+    dfs_start = time.perf_counter()
+    DFS_success = DFS_algorithm.dfs_scheduling(schedule, employee_hours, day_indices, 0, 0, 0, num_days, user_employees, user_shifts, stats, holiday_mask=holiday_mask, week_keys=week_keys, slot_candidates=slot_candidates)
+    timings["dfs"] = round(time.perf_counter() - dfs_start, 4)
 
     if DFS_success:
-        print("DFS Minimums Met. Running Maximizer...")
-        DFS_algorithm.scheduleMaximizer(schedule, employee_hours, day_indices, 0, 0, 0, num_days, user_employees, user_shifts)
+        alg_helper.trace("DFS Minimums Met. Running Maximizer...")
+        maximizer_start = time.perf_counter()
+        DFS_algorithm.scheduleMaximizer(schedule, employee_hours, day_indices, 0, 0, 0, num_days, user_employees, user_shifts, stats, holiday_mask, week_keys, hours_ledger["past_hours"], hints)
+        timings["maximizer"] = round(time.perf_counter() - maximizer_start, 4)
+        if hints:
+            stats["hint_hits"] = sum(
+                len(set(names) & set(schedule[date_str][shift_name]))
+                for date_str, day_hints in zip(day_indices, hints) for shift_name, names in day_hints.items()
+            )
         return schedule
     else:
-        print("DFS failed to find a valid schedule.")
+        alg_helper.trace("DFS failed to find a valid schedule.")
         return None
 
 """
-A wrapper function that calculates the algorithm's runtime and handles errors.
+Turns a prior schedule into warm-start hints for the horizon (see alg_helper.align_hint), dropping holidays,
+unknown employees and shifts. Returns (hints [{shift: [names]}], slot_candidates [{shift: [employees]}]),
+both aligned with day_indices, and counts the usable hinted assignments in stats["hint_slots"].
 """
-def generate_schedule(start_date_str: str, num_days: int, user_id: int):
+def compile_hints(day_indices, holiday_mask, hint_schedule, user_employees, user_shifts, stats):
+    employees_by_name = {emp['name']: emp for emp in user_employees}
+    shift_names = {shift['shift_name'] for shift in user_shifts}
+
+    hints = []
+    slot_candidates = []
+    for is_holiday, prior_day in zip(holiday_mask, alg_helper.align_hint(day_indices, hint_schedule)):
+        day_hints = {}
+        day_candidates = {}
+        if not is_holiday:
+            for shift_name, names in prior_day.items():
+                hinted = list(dict.fromkeys(name for name in names if name in employees_by_name))
+                if shift_name not in shift_names or not hinted:
+                    continue
+                day_hints[shift_name] = hinted
+                day_candidates[shift_name] = [employees_by_name[name] for name in hinted] + \
+                    [emp for emp in user_employees if emp['name'] not in day_hints[shift_name]]
+                stats["hint_slots"] += len(hinted)
+        hints.append(day_hints)
+        slot_candidates.append(day_candidates)
+    return hints, slot_candidates
+
+"""
+Returns the schedule last saved by commit_hours for an account (nested format), or None.
+"""
+def load_committed_schedule(session, user_id: int):
+    row = session.exec(select(CommittedScheduleRow).where(CommittedScheduleRow.accountID == user_id)).first()
+    return alg_helper.expand_schedule(json.loads(row.schedule)) if row else None
+
+"""
+Inserts a row, or updates the existing one with the same key_columns (which must carry a unique constraint).
+A single INSERT ... ON CONFLICT statement, so two concurrent writers can't both insert the row.
+"""
+def upsert(session, model, key_columns, values):
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    statement = insert(model).values(**values).on_conflict_do_update(
+        index_elements=key_columns,
+        set_={column: value for column, value in values.items() if column not in key_columns}
+    )
+    session.execute(statement)
+
+"""
+Saves a schedule as the account's committed schedule, replacing the previous one.
+"""
+def save_committed_schedule(session, user_id: int, schedule):
+    dates = sorted(schedule)
+    upsert(session, CommittedScheduleRow, ["accountID"], {
+        "accountID": user_id,
+        "start_date": dates[0] if dates else "",
+        "num_days": len(dates),
+        "schedule": json.dumps(alg_helper.compact_schedule(schedule))
+    })
+
+"""
+Loads the hours ledger a solve starts from:
+- week_hours {emp_id: {week: hours}}: hours already committed in the horizon's ISO weeks on days outside
+  the horizon (e.g. Monday-Tuesday before a Wednesday start), so weekly caps hold across runs.
+- past_hours {emp_id: hours}: totals of the fairness_weeks ISO weeks before the horizon, one row per week.
+"""
+def load_hours_ledger(session, user_id: int, day_indices, fairness_weeks: int = 0):
+    horizon_days = {}  # {week: set of weekdays inside the horizon}
+    for date_str in day_indices:
+        horizon_days.setdefault(alg_helper.iso_week_key(date_str), set()).add(alg_helper.weekday_of(date_str))
+
+    week_hours = {}
+    statement = select(EmployeeHoursLedgerRow).where(
+        EmployeeHoursLedgerRow.accountID == user_id,
+        EmployeeHoursLedgerRow.iso_week.in_(list(horizon_days))
+    )
+    for row in session.exec(statement).all():
+        day_hours = json.loads(row.day_hours)
+        carried = sum(hours for weekday, hours in enumerate(day_hours) if weekday not in horizon_days[row.iso_week])
+        if carried:
+            week_hours.setdefault(row.employee_id, {})[row.iso_week] = carried
+
+    past_hours = {}
+    if fairness_weeks > 0 and day_indices:
+        first_day = datetime.strptime(day_indices[0], '%Y-%m-%d')
+        past_weeks = [alg_helper.iso_week_key((first_day - timedelta(weeks=i)).strftime('%Y-%m-%d'))
+                      for i in range(1, fairness_weeks + 1)]
+        statement = select(EmployeeHoursLedgerRow).where(
+            EmployeeHoursLedgerRow.accountID == user_id,
+            EmployeeHoursLedgerRow.iso_week.in_(past_weeks)
+        )
+        for row in session.exec(statement).all():
+            past_hours[row.employee_id] = past_hours.get(row.employee_id, 0) + row.hours
+
+    return {"week_hours": week_hours, "past_hours": past_hours}
+
+"""
+Writes a schedule's hours into the ledger. Days inside the schedule's horizon are overwritten (so
+regenerating a period replaces its hours instead of adding to them); other days of the week are kept.
+"""
+def commit_hours_ledger(user_id: int, schedule, user_emps, user_shifts):
+    ids_by_name = {emp['name']: emp['id'] for emp in user_emps}
+    shift_hours = {shift['shift_name']: alg_helper.get_shift_duration(shift) for shift in user_shifts}
+
+    # New hours per (employee, week, weekday), one O(1) update per assignment
+    new_hours = {}
+    horizon_days = {}
+    for date_str, shifts in schedule.items():
+        week_key = alg_helper.iso_week_key(date_str)
+        weekday = alg_helper.weekday_of(date_str)
+        horizon_days.setdefault(week_key, set()).add(weekday)
+        for shift_name, names in shifts.items():
+            for emp_name in names:
+                key = (ids_by_name[emp_name], week_key)
+                day_hours = new_hours.setdefault(key, [0.0] * 7)
+                day_hours[weekday] += shift_hours[shift_name]
+
+    with Session(engine) as session:
+        # Existing rows are locked until commit on Postgres; rows another commit inserts meanwhile are
+        # caught by the unique constraint and updated by the upsert instead of duplicated
+        statement = select(EmployeeHoursLedgerRow).where(
+            EmployeeHoursLedgerRow.accountID == user_id,
+            EmployeeHoursLedgerRow.iso_week.in_(list(horizon_days))
+        ).with_for_update()
+        stored = {(row.employee_id, row.iso_week): json.loads(row.day_hours) for row in session.exec(statement).all()}
+
+        for emp_id in ids_by_name.values():
+            for week_key, weekdays in horizon_days.items():
+                day_hours = stored.get((emp_id, week_key))
+                fresh = new_hours.get((emp_id, week_key))
+                if day_hours is None and fresh is None:
+                    continue
+                if day_hours is None:
+                    day_hours = [0.0] * 7
+                for weekday in weekdays:
+                    day_hours[weekday] = fresh[weekday] if fresh else 0.0
+                upsert(session, EmployeeHoursLedgerRow, ["accountID", "employee_id", "iso_week"], {
+                    "accountID": user_id,
+                    "employee_id": emp_id,
+                    "iso_week": week_key,
+                    "hours": sum(day_hours),
+                    "day_hours": json.dumps(day_hours)
+                })
+
+        # The committed schedule is also the default warm-start hint for the next period
+        save_committed_schedule(session, user_id, schedule)
+        session.commit()
+
+"""
+Returns the hours ledger of an account: {employee_id: {iso_week: hours}}.
+"""
+@app.get("/hours_ledger/{user_id}")
+def get_hours_ledger(user_id: int):
+    with Session(engine) as session:
+        statement = select(EmployeeHoursLedgerRow).where(EmployeeHoursLedgerRow.accountID == user_id)
+        ledger = {}
+        for row in session.exec(statement).all():
+            ledger.setdefault(row.employee_id, {})[row.iso_week] = row.hours
+    return {"status": "success", "ledger": ledger}
+
+"""
+Returns the holiday regions applied to an account, falling back to the default calendar.
+"""
+def load_holiday_regions(session, user_id: int):
+    statement = select(AccountHolidayCalendarRow).where(AccountHolidayCalendarRow.accountID == user_id)
+    regions = [row.region for row in session.exec(statement).all()]
+    return regions or [holiday_calendar.DEFAULT_REGION]
+
+"""
+Loads an account's shifts, employees (with availability and vacations) and holiday regions
+in the dict shapes the scheduling algorithm works with.
+"""
+def load_schedule_inputs(user_id: int):
     with Session(engine) as session:
         # 1. Fetch the user's raw shifts from the database
         shift_statement = select(ShiftRow).where(ShiftRow.accountID == user_id)
@@ -608,22 +1237,28 @@ def generate_schedule(start_date_str: str, num_days: int, user_id: int):
         emp_statement = select(EmployeeRow).where(EmployeeRow.accountID == user_id)
         db_employees = session.exec(emp_statement).all()
         
+        # Child table preferences and vacations for every employee, one IN (...) query each
+        employee_ids = [emp.employee_id for emp in db_employees]
+        availability_by_emp = {}
+        vacations_by_emp = {}
+        if employee_ids:
+            avail_stmt = select(EmployeeAvailabilityRow).where(EmployeeAvailabilityRow.employee_id.in_(employee_ids))
+            for row in session.exec(avail_stmt).all():
+                availability_by_emp.setdefault(row.employee_id, {})[row.shift_name] = row.is_available
+            vac_stmt = select(EmployeeVacationRow).where(EmployeeVacationRow.employee_id.in_(employee_ids))
+            for v in session.exec(vac_stmt).all():
+                vacations_by_emp.setdefault(v.employee_id, []).append([v.start_date, v.end_date])
+
         user_emps = []
         for emp in db_employees:
-            # Re-fetch child table preferences
-            avail_stmt = select(EmployeeAvailabilityRow).where(EmployeeAvailabilityRow.employee_id == emp.employee_id)
-            db_avail = session.exec(avail_stmt).all()
-            availability_dict = {row.shift_name: row.is_available for row in db_avail}
+            availability_dict = availability_by_emp.get(emp.employee_id, {})
             
             # Default missing checkmarks to available (1)
             for s in user_shifts:
                 if s["shift_name"] not in availability_dict:
                     availability_dict[s["shift_name"]] = 1
                     
-            # Re-fetch child table vacations
-            vac_stmt = select(EmployeeVacationRow).where(EmployeeVacationRow.employee_id == emp.employee_id)
-            db_vac = session.exec(vac_stmt).all()
-            vacation_list = [[v.start_date, v.end_date] for v in db_vac]
+            vacation_list = vacations_by_emp.get(emp.employee_id, [])
             
             user_emps.append({
                 "owner_id": emp.accountID,
@@ -633,23 +1268,72 @@ def generate_schedule(start_date_str: str, num_days: int, user_id: int):
                 "vacation": vacation_list,
                 "availability": availability_dict
             })
-    
-    if not user_shifts or not user_emps:
-        return {"error": "No shifts or employees to schedule."}
 
+        # 3. Fetch the holiday calendars applied to this account
+        holiday_regions = load_holiday_regions(session, user_id)
+
+    return user_shifts, user_emps, holiday_regions
+
+"""
+Share of the hint's usable assignments the result kept (1.0 = same as the prior schedule), or None if none applied.
+"""
+def hint_hit_rate(stats):
+    return round(stats["hint_hits"] / stats["hint_slots"], 4) if stats["hint_slots"] else None
+
+"""
+A wrapper function that calculates the algorithm's runtime and handles errors.
+"""
+def generate_schedule(start_date_str: str, num_days: int, user_id: int, metrics=None, commit_hours=False, fairness_weeks=0,
+                      warm_start=False, hint_schedule=None):
     try:
         start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
     except ValueError:
         return {"error": "Invalid date format. Use YYYY-MM-DD."}
+
+    # An uploaded hint may come in either /generate format
+    if hint_schedule and "assignments" in hint_schedule:
+        try:
+            hint_schedule = alg_helper.expand_schedule(hint_schedule)
+        except (KeyError, IndexError, TypeError, ValueError):
+            return {"error": "Malformed compact hint_schedule."}
+    if hint_schedule and alg_helper.schedule_shape_error(hint_schedule):
+        return {"error": "hint_schedule must be {YYYY-MM-DD: {shift: [names]}} or the compact format."}
+
+    if metrics is None:
+        metrics = {"timings": {}, "search": alg_helper.new_search_stats()}
+    timings = metrics["timings"]
+
+    db_load_start = time.perf_counter()
+    user_shifts, user_emps, holiday_regions = load_schedule_inputs(user_id)
+    db_load_seconds = time.perf_counter() - db_load_start
+
+    # Compiled here because the ledger lookup needs the horizon; dfs_schedule_helper adds its own compile time
+    compile_start = time.perf_counter()
+    compiled = compile_schedule_problem(start_date, num_days, holiday_regions)
+    timings["compile"] = round(time.perf_counter() - compile_start, 4)
+
+    db_load_start = time.perf_counter()
+    with Session(engine) as session:
+        hours_ledger = load_hours_ledger(session, user_id, compiled["day_indices"], fairness_weeks)
+        if warm_start and not hint_schedule:
+            hint_schedule = load_committed_schedule(session, user_id)
+    timings["db_load"] = round(db_load_seconds + time.perf_counter() - db_load_start, 4)
+    
+    if not user_shifts or not user_emps:
+        return {"error": "No shifts or employees to schedule."}
         
     start_time = time.time()
-    dfs_schedule = dfs_schedule_helper(start_date, num_days, user_emps, user_shifts)
+    dfs_schedule = dfs_schedule_helper(start_date, num_days, user_emps, user_shifts, metrics, holiday_regions, compiled, hours_ledger, hint_schedule)
     end_time = time.time()
     
     if dfs_schedule:
+        if commit_hours:
+            commit_hours_ledger(user_id, dfs_schedule, user_emps, user_shifts)
         return {
             "status": "success",
             "runtime": round(end_time - start_time, 4),
+            "hours_committed": commit_hours,
+            "hint_hit_rate": hint_hit_rate(metrics["search"]) if hint_schedule else None,
             "schedule": dfs_schedule
         }
     return {"error": "Algorithm failed to find a schedule."}
@@ -657,16 +1341,31 @@ def generate_schedule(start_date_str: str, num_days: int, user_id: int):
 
 
 
+"""
+Serves the frontend from static/ only (not the repo root). Nothing is cached without revalidation: asset
+URLs are not versioned and the HTML and script.js change together (e.g. the /generate wire format), so
+RevalidatedStaticFiles sends every file with no-cache. Browsers keep their copy but check its ETag on each
+load and get a 304 when nothing changed.
+"""
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+class RevalidatedStaticFiles(StaticFiles):
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
 """
 Serves the main frontend page when the website is first loaded.
 """
 @app.get("/")
 async def read_index():
-    return FileResponse('homepage.html')
+    return FileResponse(os.path.join(STATIC_DIR, 'homepage.html'), headers={"Cache-Control": "no-cache"})
 
 
 
-app.mount("/", StaticFiles(directory=".", html=True), name="static")
+app.mount("/", RevalidatedStaticFiles(directory=STATIC_DIR, html=True), name="static")
+startup_timings["app"] = time.perf_counter()
 
 
 
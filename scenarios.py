@@ -0,0 +1,82 @@
+import copy
+
+"""
+What-if overrides applied to an account's loaded shifts and employees before solving.
+Each override is a dict with a "type":
+
+  min_employees / max_employees  {"value": n} or {"delta": +n}, optional "shifts": [names],
+                                 optional "weekdays": [0-6] (Monday = 0) to change only those days
+  hours_cap                      {"max_hours_per_week": n}, optional "employees": [names],
+                                 optional "hours_at_most": n to pick employees at or under n h/wk (part-timers)
+  vacation                       {"employee": name, "start_date": "YYYY-MM-DD", "end_date": "YYYY-MM-DD"}
+  availability                   {"employee": name, "shift": name, "available": 0 or 1}
+
+Inputs are never modified; the variant gets its own copies.
+"""
+OVERRIDE_TYPES = ("min_employees", "max_employees", "hours_cap", "vacation", "availability")
+
+
+"""
+Returns (user_emps, user_shifts) with the overrides applied. Raises ValueError on an unknown
+override type, shift or employee so the caller can report it per scenario.
+"""
+def apply_overrides(user_emps, user_shifts, overrides):
+    user_emps = copy.deepcopy(user_emps)
+    user_shifts = copy.deepcopy(user_shifts)
+    emps_by_name = {emp['name']: emp for emp in user_emps}
+    shifts_by_name = {shift['shift_name']: shift for shift in user_shifts}
+
+    for override in overrides:
+        kind = override.get("type")
+        if kind in ("min_employees", "max_employees"):
+            for shift in pick(shifts_by_name, override.get("shifts"), "shift"):
+                apply_staffing(shift, kind, override)
+
+        elif kind == "hours_cap":
+            cap = int(override["max_hours_per_week"])
+            hours_at_most = override.get("hours_at_most")
+            for emp in pick(emps_by_name, override.get("employees"), "employee"):
+                if hours_at_most is None or emp['hours_per_week'] <= hours_at_most:
+                    emp['hours_per_week'] = min(emp['hours_per_week'], cap)
+
+        elif kind == "vacation":
+            emp = pick(emps_by_name, [override["employee"]], "employee")[0]
+            emp['vacation'].append([override["start_date"], override["end_date"]])
+
+        elif kind == "availability":
+            emp = pick(emps_by_name, [override["employee"]], "employee")[0]
+            shift = pick(shifts_by_name, [override["shift"]], "shift")[0]
+            emp['availability'][shift['shift_name']] = int(override["available"])
+
+        else:
+            raise ValueError(f"Unknown override type: {kind}. Use one of {', '.join(OVERRIDE_TYPES)}.")
+
+    return user_emps, user_shifts
+
+"""
+Returns the named items, or all of them when names is None.
+"""
+def pick(items_by_name, names, label):
+    if names is None:
+        return list(items_by_name.values())
+    unknown = [name for name in names if name not in items_by_name]
+    if unknown:
+        raise ValueError(f"Unknown {label}(s): {', '.join(unknown)}")
+    return [items_by_name[name] for name in names]
+
+"""
+Applies a min/max staffing override to one shift, either for every day or for chosen weekdays only.
+"""
+def apply_staffing(shift, kind, override):
+    def updated(current):
+        value = override["value"] if "value" in override else current + override.get("delta", 0)
+        return max(0, int(value))
+
+    weekdays = override.get("weekdays")
+    if weekdays is None:
+        shift[kind] = updated(shift[kind])
+        return
+
+    by_weekday = shift.setdefault(kind.replace("_employees", "_by_weekday"), {})
+    for weekday in weekdays:
+        by_weekday[int(weekday)] = updated(by_weekday.get(int(weekday), shift[kind]))
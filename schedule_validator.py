@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta
+import alg_helper
+import holiday_calendar
+
+"""
+Checks a (possibly hand edited) schedule in the nested /generate shape {date: {shift: [names]}} against
+the account's rules without re-running the solver. Indexes are built once, then every assignment is
+visited exactly once; weekly hour caps and coverage are checked from the totals gathered in that pass.
+Weeks are ISO weeks, the same as dfs_scheduling and the hours ledger. carried_hours {emp_id: {week: hours}}
+(optional) are ledger hours on days outside the schedule that also count toward the weekly caps.
+holiday_mask (optional) is a precomputed list of bools aligned with the sorted dates, e.g. the solver's
+compiled mask, so the schedule is checked against the same holidays it was solved with.
+"""
+def validate_schedule(schedule, user_employees, user_shifts, holiday_regions=None, carried_hours=None, holiday_mask=None):
+    dates = sorted(schedule)
+    if not dates:
+        return {"valid": True, "violations": [], "counts": {}, "scores": score_schedule({}, {}, [], 0)}
+    # 1. Precomputed indexes
+    employees_by_name = {emp['name']: emp for emp in user_employees}
+    shifts_by_name = {shift['shift_name']: shift for shift in user_shifts}
+    shift_hours = {name: alg_helper.get_shift_duration(shift) for name, shift in shifts_by_name.items()}
+    if holiday_mask is None:
+        holiday_mask = holiday_calendar.holiday_mask(dates, holiday_regions)
+    holiday_days = {date_str for date_str, is_holiday in zip(dates, holiday_mask) if is_holiday}
+    vacation_days = vacation_day_index(user_employees, dates[0], dates[-1])
+    week_of = dict(zip(dates, alg_helper.week_keys(dates)))
+    week_start = {}  # {week: first date of it in the schedule}
+    for date_str in dates:
+        week_start.setdefault(week_of[date_str], date_str)
+
+    violations = []
+    def flag(kind, date_str, shift_name, emp_name, message):
+        violations.append({"type": kind, "date": date_str, "shift": shift_name, "employee": emp_name, "message": message})
+
+    # 2. Single pass over every assignment
+    week_hours = {}       # {(name, week): hours}
+    slot_counts = []      # [(date, shift, assigned)] for coverage
+    for date_str in dates:
+        working_today = set()
+        is_holiday = date_str in holiday_days
+        for shift_name in schedule[date_str]:
+            if shift_name not in shifts_by_name:
+                flag("unknown_shift", date_str, shift_name, None, f"{shift_name} is not a shift on this account.")
+
+        # Every shift of the account is checked each day; a shift left out of the payload has nobody assigned
+        for shift_name in shifts_by_name:
+            assigned = schedule[date_str].get(shift_name, [])
+            slot_counts.append((date_str, shift_name, len(assigned)))
+
+            for emp_name in assigned:
+                emp = employees_by_name.get(emp_name)
+                if emp is None:
+                    flag("unknown_employee", date_str, shift_name, emp_name, f"{emp_name} is not an employee on this account.")
+                    continue
+                if is_holiday:
+                    flag("holiday", date_str, shift_name, emp_name, f"{date_str} is a holiday.")
+                if emp.get("availability", {}).get(shift_name) != 1:
+                    flag("availability", date_str, shift_name, emp_name, f"{emp_name} is not available for {shift_name}.")
+                if date_str in vacation_days.get(emp_name, ()):
+                    flag("vacation", date_str, shift_name, emp_name, f"{emp_name} is on vacation.")
+                if emp_name in working_today:
+                    flag("double_shift", date_str, shift_name, emp_name, f"{emp_name} is assigned more than once on {date_str}.")
+                working_today.add(emp_name)
+
+                key = (emp_name, week_of[date_str])
+                week_hours[key] = week_hours.get(key, 0.0) + shift_hours[shift_name]
+
+    # 3. Checks on the totals gathered above
+    carried_hours = carried_hours or {}
+    for (emp_name, week), hours in week_hours.items():
+        emp = employees_by_name[emp_name]
+        carried = carried_hours.get(emp['id'], {}).get(week, 0)
+        cap = emp['hours_per_week']
+        if hours + carried > cap:
+            detail = f" plus {carried:g}h already recorded" if carried else ""
+            flag("weekly_hours", week_start[week], None, emp_name, f"{emp_name} has {hours:g}h{detail} in week {week} (cap {cap}h).")
+
+    for date_str, shift_name, count in slot_counts:
+        if date_str in holiday_days:
+            continue
+        min_employees, max_employees = alg_helper.shift_bounds(shifts_by_name[shift_name], date_str)
+        if count < min_employees:
+            flag("under_min", date_str, shift_name, None, f"{shift_name} on {date_str} has {count} of minimum {min_employees}.")
+        elif count > max_employees:
+            flag("over_max", date_str, shift_name, None, f"{shift_name} on {date_str} has {count}, above maximum {max_employees}.")
+
+    counts = {}
+    for violation in violations:
+        counts[violation["type"]] = counts.get(violation["type"], 0) + 1
+
+    open_slots = [slot for slot in slot_counts if slot[0] not in holiday_days]
+    return {
+        "valid": not violations,
+        "violations": violations,
+        "counts": counts,
+        "scores": score_schedule(week_hours, employees_by_name, open_slots, len(set(week_of.values())), shifts_by_name)
+    }
+
+"""
+Expands each employee's vacation ranges into a set of date strings, clipped to the schedule horizon.
+"""
+def vacation_day_index(user_employees, first_date_str, last_date_str):
+    horizon_start = datetime.strptime(first_date_str, '%Y-%m-%d')
+    horizon_end = datetime.strptime(last_date_str, '%Y-%m-%d')
+    index = {}
+    for emp in user_employees:
+        days = set()
+        for start_date_str, end_date_str in emp.get("vacation", []):
+            current = max(datetime.strptime(start_date_str, '%Y-%m-%d'), horizon_start)
+            end_date = min(datetime.strptime(end_date_str, '%Y-%m-%d'), horizon_end)
+            while current <= end_date:
+                days.add(current.strftime('%Y-%m-%d'))
+                current += timedelta(days=1)
+        if days:
+            index[emp['name']] = days
+    return index
+
+"""
+Coverage: share of required (min) and allowed (max) staffing that is filled on working days.
+Fairness: Jain's index over each employee's share of their available hours (1.0 = perfectly even).
+"""
+def score_schedule(week_hours, employees_by_name, open_slots, num_weeks, shifts_by_name=None):
+    required = allowed = filled_required = filled_allowed = 0
+    for date_str, shift_name, count in open_slots:
+        min_employees, max_employees = alg_helper.shift_bounds(shifts_by_name[shift_name], date_str)
+        required += min_employees
+        allowed += max_employees
+        filled_required += min(count, min_employees)
+        filled_allowed += min(count, max_employees)
+
+    total_hours = {name: 0.0 for name in employees_by_name}
+    for (emp_name, _), hours in week_hours.items():
+        total_hours[emp_name] += hours
+
+    utilization = [
+        total_hours[name] / (emp['hours_per_week'] * num_weeks)
+        for name, emp in employees_by_name.items() if emp['hours_per_week'] > 0 and num_weeks
+    ]
+    squares = sum(u * u for u in utilization)
+    fairness = (sum(utilization) ** 2) / (len(utilization) * squares) if squares else 1.0
+
+    return {
+        "min_coverage": round(filled_required / required, 4) if required else 1.0,
+        "max_fill": round(filled_allowed / allowed, 4) if allowed else 1.0,
+        "fairness": round(fairness, 4),
+        "total_hours": sum(total_hours.values()),
+        "hours_by_employee": total_hours
+    }
@@ -21,7 +21,8 @@ async function generateSchedule() {
     const data = {
         owner_id: parseInt(getCookie('userID')),
         start_date: document.getElementById('startDate').value,
-        num_days: parseInt(document.getElementById('num_days').value)
+        num_days: parseInt(document.getElementById('num_days').value),
+        format: "compact"
     };
 
     const response = await fetch('/generate', {
@@ -33,12 +34,27 @@ async function generateSchedule() {
     const result = await response.json();
     
     if (result.status === "success") {
-        renderScheduleTable(result.schedule);
+        const scheduleData = result.format === "compact" ? expandCompactSchedule(result.schedule) : result.schedule;
+        renderScheduleTable(scheduleData);
     } else {
         document.getElementById('scheduleOutput').innerHTML = `<p style="color:red;">Error: ${result.message}</p>`;
     }
 }
 
+/*
+Rebuilds the nested {date: {shift: [names]}} schedule from the compact name table + index arrays format.
+*/
+function expandCompactSchedule(compact) {
+    const scheduleData = {};
+    compact.dates.forEach((date, dayPos) => {
+        scheduleData[date] = {};
+        compact.shifts.forEach((shiftName, shiftPos) => {
+            scheduleData[date][shiftName] = compact.assignments[shiftPos][dayPos].map(i => compact.names[i]);
+        });
+    });
+    return scheduleData;
+}
+
 /*
 Generates the HTML structure to display the finalized schedule in a readable table format on the web page.
 */